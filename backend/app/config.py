@@ -25,6 +25,74 @@ class Settings(BaseSettings):
     # Scraper defaults
     default_delay: float = 1.5
     default_num_results: int = 20
+    # Most category x location searches one batch job may run
+    max_batch_queries: int = 50
+    # Leads are inserted in batches of this size as they finish
+    persist_batch_size: int = 25
+    # Pick up jobs left PENDING/RUNNING by a process that died: on startup and,
+    # with JOB_QUEUE=memory, whenever their owner's heartbeat has expired
+    resume_jobs_on_startup: bool = True
+    # "threads" runs each job in its own thread; "async" runs every job on one
+    # shared event loop with an async HTTP client
+    scrape_engine: str = "threads"
+    # Job scheduling: running jobs are capped globally and per user, the rest
+    # wait in a queue shared fairly across users (full queue -> HTTP 429)
+    max_running_jobs: int = 4
+    max_running_jobs_per_user: int = 2
+    max_queued_jobs: int = 100
+    # "memory" runs jobs inside the API process; "database" queues them in the
+    # job_queue table for separate `python -m app.worker` processes
+    job_queue: str = "memory"
+    worker_concurrency: int = 2
+    worker_poll_interval: float = 1.0
+    # Workers renew their lease on a running job; an expired lease means the
+    # worker died and the job is claimed again, up to job_max_attempts times.
+    # With JOB_QUEUE=memory, API processes heartbeat their jobs the same way.
+    job_lease_seconds: float = 60
+    job_max_attempts: int = 3
+    # Threaded engine: workers per pipeline stage (fetch workers come from the
+    # job's concurrency) and the capacity of the queue in front of each stage
+    parse_workers: int = 2
+    enrich_workers: int = 2
+    stage_queue_size: int = 50
+    # Processes that parse pages off the GIL, shared by all jobs in a process
+    # (0 = parse in the calling thread). Keep parse_workers at least this high.
+    parse_processes: int = 0
+    # Keep-alive connection pool for website fetches, one per job: hosts that
+    # keep idle connections, and connections per host
+    http_pool_hosts: int = 100
+    http_pool_per_host: int = 2
+    # Website pages are streamed and cut off after this many bytes (0 = no cap);
+    # responses that are not HTML are dropped once their headers arrive
+    max_page_bytes: int = 2_000_000
+    # Seconds to resolve and connect to a site's host before crawling it; sites
+    # that fail are skipped whole (0 = no probe, e.g. behind an HTTP proxy)
+    host_probe_timeout: float = 5.0
+    # Consecutive failed page fetches (connection errors, 5xx) before a job stops
+    # requesting a host, and seconds until it lets one trial request through
+    breaker_failures: int = 2
+    breaker_cooldown: float = 300
+    # Hours later jobs skip a host this job found unreachable (0 = no cache)
+    dead_host_ttl_hours: float = 24
+    # Requests a site may get back to back before the job's per-host delay applies
+    host_burst: int = 2
+    # Honour robots.txt, cached per domain across jobs for robots_ttl_hours;
+    # a Crawl-delay slows that host down, up to max_crawl_delay seconds
+    respect_robots: bool = True
+    robots_ttl_hours: float = 24
+    max_crawl_delay: float = 10
+    # Hours a crawled page's ETag/Last-Modified, content hash and extracted
+    # signals are kept; a later crawl re-fetches it conditionally and reuses
+    # the signals when it is unchanged (0 = no cache)
+    page_cache_ttl_hours: float = 168
+    # Search and enrichment APIs (Serper, SerpAPI, Hunter, Apollo), shared by all
+    # jobs in a process: most concurrent calls per provider (halved on a 429 or
+    # a call slower than provider_slow_seconds, regained as calls succeed),
+    # retries of 429/5xx, and the longest Retry-After worth waiting for
+    provider_max_concurrency: int = 4
+    provider_slow_seconds: float = 5.0
+    provider_max_retries: int = 2
+    provider_max_wait: float = 30
 
     # CORS — accepts a comma-separated string or "*"
     # Kept as str so pydantic-settings doesn't try to JSON-parse it
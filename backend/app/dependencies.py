@@ -4,10 +4,16 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import SessionLocal
 from app.events.bus import EventBus
+from app.events.db_bus import DatabaseEventBus
+from app.jobs.async_runner import AsyncJobRunner
 from app.jobs.background_runner import BackgroundJobRunner
+from app.jobs.cancellation import CancellationRegistry
+from app.jobs.db_runner import DatabaseJobRunner
 from app.jobs.interface import JobRunner
+from app.jobs.scheduler import FairShareScheduler
 from app.models.user import User
 from app.services.auth_service import decode_token
 
@@ -39,9 +45,22 @@ def get_current_user(
     return user
 
 
+def _build_job_runner() -> JobRunner:
+    if settings.job_queue == "database":
+        return DatabaseJobRunner(max_queued=settings.max_queued_jobs, lease_seconds=settings.job_lease_seconds)
+    return FairShareScheduler(
+        AsyncJobRunner() if settings.scrape_engine == "async" else BackgroundJobRunner(),
+        max_running=settings.max_running_jobs,
+        max_running_per_user=settings.max_running_jobs_per_user,
+        max_queued=settings.max_queued_jobs,
+    )
+
+
 # Singletons
-_job_runner = BackgroundJobRunner()
-_event_bus = EventBus()
+_job_runner = _build_job_runner()
+# Jobs in worker processes publish through the database; the API relays them to SSE clients
+_event_bus = DatabaseEventBus() if settings.job_queue == "database" else EventBus()
+_cancellation_registry = CancellationRegistry()
 
 
 def get_job_runner() -> JobRunner:
@@ -50,3 +69,7 @@ def get_job_runner() -> JobRunner:
 
 def get_event_bus() -> EventBus:
     return _event_bus
+
+
+def get_cancellation_registry() -> CancellationRegistry:
+    return _cancellation_registry
@@ -13,30 +13,38 @@ class EventBus:
     """In-process pub/sub using asyncio.Queue per subscriber."""
 
     def __init__(self):
-        self._subscribers: dict[str, list[asyncio.Queue]] = defaultdict(list)
+        self._subscribers: dict[str, list[tuple[asyncio.Queue, asyncio.AbstractEventLoop | None]]] = defaultdict(list)
 
     def subscribe(self, channel: str) -> asyncio.Queue:
         queue: asyncio.Queue = asyncio.Queue(maxsize=100)
-        self._subscribers[channel].append(queue)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        self._subscribers[channel].append((queue, loop))
         return queue
 
     def unsubscribe(self, channel: str, queue: asyncio.Queue):
         if channel in self._subscribers:
-            self._subscribers[channel] = [q for q in self._subscribers[channel] if q is not queue]
+            self._subscribers[channel] = [s for s in self._subscribers[channel] if s[0] is not queue]
             if not self._subscribers[channel]:
                 del self._subscribers[channel]
 
     def publish(self, channel: str, event: ScrapeEvent):
-        """Publish from a sync context (background thread) to async subscribers."""
-        for queue in self._subscribers.get(channel, []):
-            try:
-                loop = asyncio.get_running_loop()
-                loop.call_soon_threadsafe(queue.put_nowait, event)
-            except RuntimeError:
-                # No running loop — try direct put
-                try:
-                    queue.put_nowait(event)
-                except asyncio.QueueFull:
-                    log.warning(f"Event queue full for channel {channel}, dropping event")
-            except asyncio.QueueFull:
-                log.warning(f"Event queue full for channel {channel}, dropping event")
+        """Publish from any thread or event loop to async subscribers.
+
+        Each queue is fed on the loop that subscribed to it, so jobs running in
+        worker threads or on the async engine's own loop deliver safely.
+        """
+        for queue, loop in list(self._subscribers.get(channel, [])):
+            if loop is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(self._put, channel, queue, event)
+            else:
+                self._put(channel, queue, event)
+
+    @staticmethod
+    def _put(channel: str, queue: asyncio.Queue, event: ScrapeEvent):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            log.warning(f"Event queue full for channel {channel}, dropping event")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.database import SessionLocal
+from app.events.bus import EventBus
+from app.events.models import ScrapeEvent
+from app.models.job_event import JobEvent
+
+log = logging.getLogger(__name__)
+
+
+class DatabaseEventBus(EventBus):
+    """Event bus shared by the API and worker processes through the job_events table.
+
+    ``publish`` only stores the event. ``relay()``, running in the API process,
+    polls for new rows and delivers them to that process's SSE subscribers.
+    """
+
+    def __init__(self, poll_interval: float = 0.5, retention_seconds: float = 3600):
+        super().__init__()
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._last_id: int | None = None
+        self._last_prune = 0.0
+
+    def publish(self, channel: str, event: ScrapeEvent):
+        db = SessionLocal()
+        try:
+            db.add(JobEvent(
+                channel=channel,
+                type=event.type,
+                data=json.dumps(event.data, default=str),
+                timestamp=event.timestamp,
+            ))
+            db.commit()
+        except Exception as e:
+            log.warning(f"Could not store {event.type} event for {channel}: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    async def relay(self):
+        while True:
+            try:
+                for channel, event in await asyncio.to_thread(self._fetch_new):
+                    super().publish(channel, event)
+            except Exception as e:
+                log.warning(f"Event relay poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def _fetch_new(self) -> list[tuple[str, ScrapeEvent]]:
+        db = SessionLocal()
+        try:
+            if self._last_id is None:
+                # Only relay events published after startup
+                self._last_id = db.query(JobEvent.id).order_by(JobEvent.id.desc()).limit(1).scalar() or 0
+            rows = db.query(JobEvent).filter(JobEvent.id > self._last_id).order_by(JobEvent.id).limit(500).all()
+            if rows:
+                self._last_id = rows[-1].id
+            events = [
+                (row.channel, ScrapeEvent(type=row.type, data=json.loads(row.data), timestamp=row.timestamp))
+                for row in rows
+            ]
+            self._prune(db)
+            return events
+        finally:
+            db.close()
+
+    def _prune(self, db):
+        if time.monotonic() - self._last_prune < 60:
+            return
+        self._last_prune = time.monotonic()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds)
+        db.query(JobEvent).filter(JobEvent.created_at < cutoff).delete(synchronize_session=False)
+        db.commit()
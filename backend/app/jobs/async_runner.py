@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine
+
+from app.jobs.interface import JobHandle, JobRunner
+
+log = logging.getLogger(__name__)
+
+
+class AsyncJobRunner(JobRunner):
+    """Runs coroutine jobs on one shared event loop in a background daemon thread."""
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._futures: dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, daemon=True, name="scrape-event-loop",
+                ).start()
+            return self._loop
+
+    def submit(
+        self, func: Callable[..., Coroutine], *args: Any, job_id: int, user_id: int | None = None, **kwargs: Any,
+    ) -> JobHandle:
+        future = asyncio.run_coroutine_threadsafe(func(*args, job_id=job_id, **kwargs), self._ensure_loop())
+        self._futures[job_id] = future
+
+        def done(f: Future):
+            self._futures.pop(job_id, None)
+            if not f.cancelled() and f.exception() is not None:
+                log.error(f"Async job {job_id} failed: {f.exception()}")
+
+        future.add_done_callback(done)
+        return JobHandle(job_id=job_id)
+
+    def cancel(self, handle: JobHandle) -> bool:
+        future = self._futures.get(handle.job_id)
+        return future.cancel() if future is not None else False
+
+    def is_running(self, job_id: int) -> bool:
+        return job_id in self._futures
@@ -15,10 +15,12 @@ class BackgroundJobRunner(JobRunner):
     def __init__(self):
         self._threads: dict[int, threading.Thread] = {}
 
-    def submit(self, func: Callable, *args: Any, job_id: int, **kwargs: Any) -> JobHandle:
+    def submit(
+        self, func: Callable, *args: Any, job_id: int, user_id: int | None = None, **kwargs: Any,
+    ) -> JobHandle:
         def wrapper():
             try:
-                func(*args, **kwargs)
+                func(*args, job_id=job_id, **kwargs)
             except Exception as e:
                 log.error(f"Background job {job_id} failed: {e}")
             finally:
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once its cancellation token has been tripped."""
+
+
+class CancellationToken:
+    """Thread-safe cancel flag with interruptible sleeps and cancel callbacks."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._abandoned = False
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def abandoned(self) -> bool:
+        """Cancelled because this process no longer owns the job, so it must not write its status."""
+        return self._abandoned
+
+    def abandon(self):
+        """Cancel a job another process has taken over, e.g. after losing its lease."""
+        self._abandoned = True
+        self.cancel()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                log.warning(f"Cancellation callback failed: {e}")
+
+    def add_callback(self, callback: Callable[[], None]):
+        """Run ``callback`` on cancel, or right away if already cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def sleep(self, seconds: float):
+        """Sleep that wakes up and raises JobCancelled as soon as the token trips."""
+        if seconds > 0 and self._event.wait(seconds):
+            raise JobCancelled()
+        self.raise_if_cancelled()
+
+
+class CancellationRegistry:
+    """Tokens for the jobs running in this process, shared by the runner and the cancel route."""
+
+    def __init__(self):
+        self._tokens: dict[int, CancellationToken] = {}
+        self._lock = threading.Lock()
+
+    def token_for(self, job_id: int) -> CancellationToken:
+        with self._lock:
+            return self._tokens.setdefault(job_id, CancellationToken())
+
+    def cancel(self, job_id: int) -> bool:
+        """Trip the job's token. Returns False if the job has no live token here."""
+        with self._lock:
+            token = self._tokens.get(job_id)
+        if token is None:
+            return False
+        token.cancel()
+        return True
+
+    def abandon(self, job_id: int) -> bool:
+        """Stop the job without touching its row; returns False if it has no live token here."""
+        with self._lock:
+            token = self._tokens.get(job_id)
+        if token is None:
+            return False
+        token.abandon()
+        return True
+
+    def release(self, job_id: int):
+        with self._lock:
+            self._tokens.pop(job_id, None)
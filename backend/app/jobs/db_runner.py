@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import importlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from sqlalchemy import func as sql_func, or_, update
+
+from app.database import SessionLocal
+from app.jobs.interface import JobHandle, JobRunner
+from app.jobs.scheduler import JobQueueFull
+from app.models.job_queue import QueuedJob
+
+log = logging.getLogger(__name__)
+
+
+def entrypoint_path(func: Callable) -> str:
+    """Importable "module:function" name of a job entry point."""
+    path = f"{func.__module__}:{func.__qualname__}"
+    if resolve_entrypoint(path) is not func:
+        raise ValueError(f"Job entry point {path} must be a module-level function")
+    return path
+
+
+def resolve_entrypoint(path: str) -> Callable:
+    module, _, name = path.partition(":")
+    target = importlib.import_module(module)
+    for attr in name.split("."):
+        target = getattr(target, attr)
+    return target
+
+
+class DatabaseJobRunner(JobRunner):
+    """Queues jobs in the job_queue table for separate worker processes.
+
+    Nothing runs in the submitting process: ``python -m app.worker`` claims
+    queued jobs with a time-limited lease and renews it while the job runs. A
+    lease left to expire by a crashed worker is claimed again, and the job
+    resumes from its checkpoint.
+    """
+
+    def __init__(self, max_queued: int = 100, lease_seconds: float = 60):
+        self.max_queued = max(0, max_queued)
+        self.lease_seconds = lease_seconds
+
+    def submit(
+        self, func: Callable, *args: Any, job_id: int, user_id: int | None = None, **kwargs: Any,
+    ) -> JobHandle:
+        if args or kwargs:
+            raise ValueError("Queued jobs are called with job_id only")
+        entrypoint = entrypoint_path(func)
+        db = SessionLocal()
+        try:
+            existing = db.query(QueuedJob).filter(QueuedJob.job_id == job_id).first()
+            if existing is not None:
+                return JobHandle(job_id=job_id, backend_id=str(existing.id))
+            if self._waiting(db).count() >= self.max_queued:
+                raise JobQueueFull(f"{self.max_queued} jobs are already queued")
+            queued = QueuedJob(job_id=job_id, user_id=user_id, entrypoint=entrypoint)
+            db.add(queued)
+            db.commit()
+            return JobHandle(job_id=job_id, backend_id=str(queued.id))
+        finally:
+            db.close()
+
+    def cancel(self, handle: JobHandle) -> bool:
+        """Drops a job no worker has claimed yet. Running jobs are stopped by their
+        worker, which watches for the job's CANCELLED status."""
+        db = SessionLocal()
+        try:
+            deleted = (
+                self._waiting(db)
+                .filter(QueuedJob.job_id == handle.job_id)
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return bool(deleted)
+        finally:
+            db.close()
+
+    def is_running(self, job_id: int) -> bool:
+        db = SessionLocal()
+        try:
+            return db.query(QueuedJob.id).filter(QueuedJob.job_id == job_id).first() is not None
+        finally:
+            db.close()
+
+    def queue_position(self, job_id: int) -> int | None:
+        db = SessionLocal()
+        try:
+            queued = self._waiting(db).filter(QueuedJob.job_id == job_id).first()
+            if queued is None:
+                return None
+            return self._waiting(db).filter(QueuedJob.id <= queued.id).count()
+        finally:
+            db.close()
+
+    # Worker side
+
+    def claim(self, worker: str, max_per_user: int) -> QueuedJob | None:
+        """Lease the next job, preferring users with the fewest jobs already running.
+
+        Claims are a conditional UPDATE, so concurrent workers never get the same job.
+        """
+        now = datetime.now(timezone.utc)
+        db = SessionLocal()
+        try:
+            running = dict(
+                db.query(QueuedJob.user_id, sql_func.count(QueuedJob.id))
+                .filter(QueuedJob.lease_owner.isnot(None), QueuedJob.lease_expires_at >= now)
+                .group_by(QueuedJob.user_id)
+                .all()
+            )
+            candidates = self._claimable(db, now).order_by(QueuedJob.id).limit(100).all()
+            candidates.sort(key=lambda q: running.get(q.user_id, 0))
+            for candidate in candidates:
+                if candidate.user_id is not None and running.get(candidate.user_id, 0) >= max_per_user:
+                    continue
+                claimed = db.execute(
+                    update(QueuedJob)
+                    .where(
+                        QueuedJob.id == candidate.id,
+                        or_(QueuedJob.lease_owner.is_(None), QueuedJob.lease_expires_at < now),
+                    )
+                    .values(
+                        lease_owner=worker,
+                        lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                        attempts=QueuedJob.attempts + 1,
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                if claimed:
+                    db.refresh(candidate)
+                    db.expunge(candidate)
+                    return candidate
+            return None
+        finally:
+            db.close()
+
+    def renew(self, worker: str, job_ids: list[int]) -> set[int]:
+        """Extend this worker's leases; returns the job ids whose lease was lost."""
+        if not job_ids:
+            return set()
+        expires = datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(QueuedJob)
+                .where(QueuedJob.job_id.in_(job_ids), QueuedJob.lease_owner == worker)
+                .values(lease_expires_at=expires)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            held = {
+                job_id for (job_id,) in
+                db.query(QueuedJob.job_id).filter(QueuedJob.job_id.in_(job_ids), QueuedJob.lease_owner == worker)
+            }
+            return set(job_ids) - held
+        finally:
+            db.close()
+
+    def release(self, worker: str, job_id: int, finished: bool):
+        """Remove a finished job from the queue, or hand an unfinished one back."""
+        db = SessionLocal()
+        try:
+            query = db.query(QueuedJob).filter(QueuedJob.job_id == job_id, QueuedJob.lease_owner == worker)
+            if finished:
+                query.delete(synchronize_session=False)
+            else:
+                query.update({"lease_owner": None, "lease_expires_at": None}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _waiting(db):
+        return db.query(QueuedJob).filter(QueuedJob.lease_owner.is_(None))
+
+    @staticmethod
+    def _claimable(db, now: datetime):
+        return db.query(QueuedJob).filter(
+            or_(QueuedJob.lease_owner.is_(None), QueuedJob.lease_expires_at < now)
+        )
@@ -13,7 +13,16 @@ class JobHandle:
 
 class JobRunner(ABC):
     @abstractmethod
-    def submit(self, func: Callable, *args: Any, job_id: int, **kwargs: Any) -> JobHandle: ...
+    def submit(
+        self, func: Callable, *args: Any, job_id: int, user_id: int | None = None, **kwargs: Any,
+    ) -> JobHandle: ...
 
     @abstractmethod
     def cancel(self, handle: JobHandle) -> bool: ...
+
+    @abstractmethod
+    def is_running(self, job_id: int) -> bool: ...
+
+    def queue_position(self, job_id: int) -> int | None:
+        """Place of a job waiting to start, for runners that queue jobs."""
+        return None
@@ -0,0 +1,117 @@
+"""Which API process owns a job run by the in-memory runner (JOB_QUEUE=memory).
+
+Several uvicorn worker processes can share one database, each with its own
+in-memory runner. A process claims a job before running or queueing it and
+heartbeats it while its runner holds it, like a worker's lease on the
+database queue; only a job whose owner stopped heartbeating (the process
+died) is taken over by another.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.jobs.interface import JobRunner
+from app.models.scrape_job import JobStatus, ScrapeJob
+
+log = logging.getLogger(__name__)
+
+# Unique per process start, so a restarted process never mistakes its
+# predecessor's jobs for its own
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# A job in these states is being run or queued by its owner while it heartbeats
+_ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING)
+
+
+class JobOwnedElsewhere(Exception):
+    """Raised when a live API process already runs or queues the job."""
+
+
+def claim_job(db: Session, job_id: int, lease_seconds: float) -> bool:
+    """Make this process the job's owner unless another live process owns it.
+
+    One conditional UPDATE, so of several processes claiming the same job at
+    once exactly one wins.
+    """
+    now = datetime.now(timezone.utc)
+    claimed = db.execute(
+        update(ScrapeJob)
+        .where(
+            ScrapeJob.id == job_id,
+            or_(
+                ScrapeJob.status.notin_(_ACTIVE_STATUSES),
+                ScrapeJob.owner.is_(None),
+                ScrapeJob.owner == PROCESS_OWNER,
+                ScrapeJob.owner_heartbeat_at.is_(None),
+                ScrapeJob.owner_heartbeat_at < now - timedelta(seconds=lease_seconds),
+            ),
+        )
+        .values(owner=PROCESS_OWNER, owner_heartbeat_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    db.commit()
+    return claimed
+
+
+class OwnerHeartbeat:
+    """Background thread that keeps this process's jobs owned and adopts orphaned ones.
+
+    Every ``lease_seconds / 3`` it renews the heartbeat of the jobs this process
+    owns and its runner still holds, then calls ``adopt`` (if given) to take
+    over jobs whose owner has gone quiet for ``lease_seconds``.
+    """
+
+    def __init__(self, job_runner: JobRunner, lease_seconds: float, adopt: Callable[[], object] | None = None):
+        self.job_runner = job_runner
+        self.lease_seconds = lease_seconds
+        self.adopt = adopt
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="job-owner-heartbeat")
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stopping.wait(self.lease_seconds / 3):
+            try:
+                self.renew()
+                if self.adopt is not None:
+                    self.adopt()
+            except Exception as e:
+                log.error(f"Job heartbeat failed: {e}", exc_info=e)
+
+    def renew(self):
+        db = SessionLocal()
+        try:
+            owned = [
+                job_id for (job_id,) in db.query(ScrapeJob.id).filter(
+                    ScrapeJob.owner == PROCESS_OWNER, ScrapeJob.status.in_(_ACTIVE_STATUSES),
+                )
+            ]
+            # A claimed job the runner no longer holds (e.g. the queue was full)
+            # is left to go stale so it can be adopted again
+            held = [job_id for job_id in owned if self.job_runner.is_running(job_id)]
+            if held:
+                db.execute(
+                    update(ScrapeJob)
+                    .where(ScrapeJob.id.in_(held), ScrapeJob.owner == PROCESS_OWNER)
+                    .values(owner_heartbeat_at=datetime.now(timezone.utc))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+        finally:
+            db.close()
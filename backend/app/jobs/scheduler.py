@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import inspect
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from app.jobs.interface import JobHandle, JobRunner
+
+log = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Raised by ``FairShareScheduler.submit`` when no more jobs can be queued."""
+
+
+@dataclass
+class _QueuedJob:
+    job_id: int
+    user_id: int | None
+    func: Callable
+    args: tuple
+    kwargs: dict = field(default_factory=dict)
+
+
+class FairShareScheduler(JobRunner):
+    """Caps running jobs globally and per user, queueing the rest.
+
+    Queued jobs are dispatched round-robin across users, so one user with a
+    long backlog cannot starve everyone else. Jobs actually run on ``inner``.
+    """
+
+    def __init__(
+        self, inner: JobRunner, max_running: int = 4, max_running_per_user: int = 2, max_queued: int = 100,
+    ):
+        self.inner = inner
+        self.max_running = max(1, max_running)
+        self.max_running_per_user = max(1, max_running_per_user)
+        self.max_queued = max(0, max_queued)
+        self._queues: dict[int | None, deque[_QueuedJob]] = {}
+        # Users with queued jobs, in the order they get their next turn
+        self._turns: deque[int | None] = deque()
+        self._running: dict[int, int | None] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, func: Callable, *args: Any, job_id: int, user_id: int | None = None, **kwargs: Any,
+    ) -> JobHandle:
+        with self._lock:
+            if job_id in self._running or self._queued(job_id) is not None:
+                return JobHandle(job_id=job_id)
+            if self._queued_count() >= self.max_queued:
+                raise JobQueueFull(f"{self.max_queued} jobs are already queued")
+            if user_id not in self._queues:
+                self._queues[user_id] = deque()
+                self._turns.append(user_id)
+            self._queues[user_id].append(_QueuedJob(job_id, user_id, func, args, kwargs))
+        self._dispatch()
+        return JobHandle(job_id=job_id)
+
+    def cancel(self, handle: JobHandle) -> bool:
+        with self._lock:
+            queued = self._queued(handle.job_id)
+            if queued is not None:
+                self._queues[queued.user_id].remove(queued)
+                self._drop_idle_user(queued.user_id)
+                return True
+        cancelled = self.inner.cancel(handle)
+        # A job cancelled before it started never reaches its own cleanup
+        if cancelled and not self.inner.is_running(handle.job_id):
+            self._finished(handle.job_id)
+        return cancelled
+
+    def is_running(self, job_id: int) -> bool:
+        with self._lock:
+            if job_id in self._running or self._queued(job_id) is not None:
+                return True
+        return self.inner.is_running(job_id)
+
+    def queue_position(self, job_id: int) -> int | None:
+        """1-based place in the dispatch order, or None if the job is not queued."""
+        with self._lock:
+            for position, queued in enumerate(self._dispatch_order(), start=1):
+                if queued.job_id == job_id:
+                    return position
+        return None
+
+    def _queued(self, job_id: int) -> _QueuedJob | None:
+        for jobs in self._queues.values():
+            for queued in jobs:
+                if queued.job_id == job_id:
+                    return queued
+        return None
+
+    def _queued_count(self) -> int:
+        return sum(len(jobs) for jobs in self._queues.values())
+
+    def _dispatch_order(self) -> list[_QueuedJob]:
+        """Queued jobs in the order round-robin dispatch would start them."""
+        queues = [list(self._queues[user_id]) for user_id in self._turns]
+        order = []
+        depth = 0
+        while any(depth < len(jobs) for jobs in queues):
+            order.extend(jobs[depth] for jobs in queues if depth < len(jobs))
+            depth += 1
+        return order
+
+    def _drop_idle_user(self, user_id: int | None):
+        if not self._queues[user_id]:
+            del self._queues[user_id]
+            self._turns.remove(user_id)
+
+    def _next_job(self) -> _QueuedJob | None:
+        if len(self._running) >= self.max_running:
+            return None
+        for _ in range(len(self._turns)):
+            user_id = self._turns[0]
+            self._turns.rotate(-1)
+            running = sum(1 for owner in self._running.values() if owner == user_id)
+            if user_id is not None and running >= self.max_running_per_user:
+                continue
+            queued = self._queues[user_id].popleft()
+            self._drop_idle_user(user_id)
+            return queued
+        return None
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                queued = self._next_job()
+                if queued is None:
+                    return
+                self._running[queued.job_id] = queued.user_id
+            try:
+                self.inner.submit(self._tracked(queued), *queued.args, job_id=queued.job_id, **queued.kwargs)
+            except Exception as e:
+                log.error(f"Could not start job {queued.job_id}: {e}")
+                self._finished(queued.job_id)
+
+    def _finished(self, job_id: int):
+        with self._lock:
+            self._running.pop(job_id, None)
+        self._dispatch()
+
+    def _tracked(self, queued: _QueuedJob) -> Callable:
+        """Wrap the job so its slot is released and the next job starts when it ends."""
+        func, job_id = queued.func, queued.job_id
+
+        if inspect.iscoroutinefunction(func):
+            async def run_async(*args: Any, **kwargs: Any):
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self._finished(job_id)
+
+            return run_async
+
+        def run(*args: Any, **kwargs: Any):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finished(job_id)
+
+        return run
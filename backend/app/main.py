@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -8,7 +9,13 @@ from fastapi.responses import FileResponse
 
 from app.config import settings
 from app.database import create_tables
+from app.dependencies import get_event_bus, get_job_runner
+from app.events.db_bus import DatabaseEventBus
+from app.jobs.ownership import OwnerHeartbeat
+from app.scraper.parse_pool import shutdown_parse_pool
+from app.scraper.providers import close_providers
 from app.routes import auth, cache, events, export, leads, scrape, settings as settings_routes, verticals
+from app.services.scrape_service import resume_interrupted_jobs
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
@@ -40,7 +47,32 @@ async def lifespan(app: FastAPI):
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
     create_tables()
+
+    job_runner = get_job_runner()
+    if settings.resume_jobs_on_startup:
+        resumed = resume_interrupted_jobs(job_runner)
+        if resumed:
+            logger.info(f"Resumed {len(resumed)} interrupted scrape job(s): {resumed}")
+
+    # In-memory jobs are owned by this process: keep them heartbeating so sibling
+    # API processes leave them alone, and adopt jobs whose process died
+    heartbeat = None
+    if settings.job_queue != "database":
+        adopt = (lambda: resume_interrupted_jobs(job_runner)) if settings.resume_jobs_on_startup else None
+        heartbeat = OwnerHeartbeat(job_runner, settings.job_lease_seconds, adopt)
+        heartbeat.start()
+
+    event_bus = get_event_bus()
+    relay = asyncio.create_task(event_bus.relay()) if isinstance(event_bus, DatabaseEventBus) else None
     yield
+    if heartbeat is not None:
+        heartbeat.stop()
+    if relay is not None:
+        relay.cancel()
+        with suppress(asyncio.CancelledError):
+            await relay
+    shutdown_parse_pool()
+    close_providers()
 
 
 def create_app() -> FastAPI:
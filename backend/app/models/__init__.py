@@ -2,5 +2,7 @@ from app.models.user import User
 from app.models.scrape_job import ScrapeJob
 from app.models.lead import Lead
 from app.models.cache import CacheEntry
+from app.models.job_queue import QueuedJob
+from app.models.job_event import JobEvent
 
-__all__ = ["User", "ScrapeJob", "Lead", "CacheEntry"]
+__all__ = ["User", "ScrapeJob", "Lead", "CacheEntry", "QueuedJob", "JobEvent"]
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.database import Base
+
+
+class JobEvent(Base):
+    """Event published by a worker process, relayed to SSE subscribers by the API."""
+
+    __tablename__ = "job_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    channel = Column(String(100), nullable=False)
+    type = Column(String(50), nullable=False)
+    data = Column(Text, nullable=False)
+    timestamp = Column(String(40), nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from app.database import Base
+
+
+class QueuedJob(Base):
+    """A scrape job waiting for, or leased by, a worker process (see app.worker)."""
+
+    __tablename__ = "job_queue"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("scrape_jobs.id"), unique=True, nullable=False)
+    user_id = Column(Integer, nullable=True, index=True)
+    # "module:function" of the job entry point, called as func(job_id=...)
+    entrypoint = Column(String(255), nullable=False)
+    lease_owner = Column(String(255), nullable=True, index=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -31,6 +31,7 @@ class Lead(Base):
     compliance_mention = Column(String(255), default="")
     ssl_valid = Column(Boolean, default=False)
     scrape_status = Column(String(100), default="")
+    pages_fetched = Column(Integer, default=0)
 
     # Hunter.io enrichment
     hunter_email = Column(String(255), default="")
@@ -1,7 +1,8 @@
 import enum
+import json
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -24,11 +25,54 @@ class ScrapeJob(Base):
     location = Column(String(255), nullable=False)
     num_results_requested = Column(Integer, default=20)
     delay = Column(Float, default=1.5)
+    concurrency = Column(Integer, default=5)
+    freshness_days = Column(Float, default=7)
+    # Comma-separated signals that end a site's crawl early (see CrawlPolicy)
+    crawl_stop_when = Column(String(100), default="")
     status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False)
     lead_count = Column(Integer, default=0)
     error_message = Column(String(500), nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     completed_at = Column(DateTime, nullable=True)
+    # JOB_QUEUE=memory: the API process running or queueing the job and its
+    # last heartbeat; only a job whose owner went quiet is resumed elsewhere
+    # (see app.jobs.ownership)
+    owner = Column(String(255), nullable=True)
+    owner_heartbeat_at = Column(DateTime, nullable=True)
+
+    # Batch jobs: [{"category": ..., "location": ...}, ...] searched as one job;
+    # None for a single category/location search
+    queries_json = Column(Text, nullable=True)
+
+    # Checkpoint: raw search results and indexes of places already handled
+    places_json = Column(Text, nullable=True)
+    done_places_json = Column(Text, default="[]")
+
+    # Pipeline counters (duplicates merged, fetches saved, ...) as a JSON object
+    stats_json = Column(Text, default="{}")
+    # Per-stage wall time, call, byte and error counters (see app.scraper.profiling)
+    profile_json = Column(Text, default="{}")
 
     user = relationship("User", back_populates="scrape_jobs")
     leads = relationship("Lead", back_populates="scrape_job", cascade="all, delete-orphan")
+
+    @property
+    def queries(self) -> list[dict]:
+        if self.queries_json:
+            return json.loads(self.queries_json)
+        return [{"category": self.category, "location": self.location}]
+
+    @property
+    def stop_when(self) -> list[str]:
+        return [s for s in (self.crawl_stop_when or "").split(",") if s]
+
+    @property
+    def stats(self) -> dict:
+        return json.loads(self.stats_json or "{}")
+
+    def update_stats(self, **values):
+        self.stats_json = json.dumps({**self.stats, **values})
+
+    @property
+    def profile(self) -> dict:
+        return json.loads(self.profile_json or "{}")
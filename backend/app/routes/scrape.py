@@ -6,35 +6,47 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
-from app.dependencies import get_current_user, get_db, get_event_bus, get_job_runner
-from app.events.bus import EventBus
-from app.jobs.interface import JobRunner
+from app.dependencies import get_cancellation_registry, get_current_user, get_db, get_job_runner
+from app.jobs.cancellation import CancellationRegistry
+from app.jobs.interface import JobHandle, JobRunner
+from app.jobs.ownership import JobOwnedElsewhere
+from app.jobs.scheduler import JobQueueFull
 from app.models.scrape_job import JobStatus, ScrapeJob
 from app.models.user import User
-from app.schemas.scrape import ScrapeJobResponse, ScrapeRequest
-from app.scraper.pipeline import ScrapeOrchestrator
+from app.scraper.providers import provider_stats
+from app.schemas.scrape import BatchScrapeRequest, ScrapeJobResponse, ScrapeRequest
+from app.services.scrape_service import RESUMABLE_STATUSES, batch_queries, submit_scrape_job
 
 router = APIRouter()
 
 
-def _get_user_api_keys(user: User) -> dict:
-    """Get API keys from user settings, falling back to server config."""
-    from app.config import settings
+def _queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many scrape jobs are queued, try again later",
+        headers={"Retry-After": "60"},
+    )
+
+
+def _job_response(job: ScrapeJob, job_runner: JobRunner) -> ScrapeJobResponse:
+    response = ScrapeJobResponse.model_validate(job)
+    if job.status == JobStatus.PENDING:
+        response.queue_position = job_runner.queue_position(job.id)
+    return response
 
-    user_keys = json.loads(user.api_keys_json or "{}")
-    return {
-        "serper_key": user_keys.get("serper_key") or settings.serper_key,
-        "serpapi_key": user_keys.get("serpapi_key") or settings.serpapi_key,
-        "hunter_key": user_keys.get("hunter_key") or settings.hunter_key,
-        "apollo_key": user_keys.get("apollo_key") or settings.apollo_key,
-    }
 
+def _create_and_submit(job: ScrapeJob, db: Session, job_runner: JobRunner) -> ScrapeJobResponse:
+    db.add(job)
+    db.commit()
+    db.refresh(job)
 
-def _get_scoring_weights(user: User) -> dict:
-    """Get scoring weights from user settings."""
-    weights = json.loads(user.scoring_weights_json or "{}")
-    return weights if weights else None
+    try:
+        submit_scrape_job(db, job, job_runner)
+    except JobQueueFull:
+        db.delete(job)
+        db.commit()
+        raise _queue_full()
+    return _job_response(job, job_runner)
 
 
 @router.post("/start", response_model=ScrapeJobResponse, status_code=status.HTTP_201_CREATED)
@@ -43,7 +55,6 @@ def start_scrape(
     db: Annotated[Session, Depends(get_db)],
     user: Annotated[User, Depends(get_current_user)],
     job_runner: Annotated[JobRunner, Depends(get_job_runner)],
-    event_bus: Annotated[EventBus, Depends(get_event_bus)],
 ):
     job = ScrapeJob(
         user_id=user.id,
@@ -51,30 +62,67 @@ def start_scrape(
         location=request.location,
         num_results_requested=request.num_results,
         delay=request.delay,
+        concurrency=request.concurrency,
+        freshness_days=request.freshness_days,
+        crawl_stop_when=",".join(request.stop_when),
         status=JobStatus.PENDING,
     )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
+    return _create_and_submit(job, db, job_runner)
 
-    # Build orchestrator with a fresh DB session for the background thread
-    orchestrator = ScrapeOrchestrator(
-        db=SessionLocal(),
-        event_bus=event_bus,
-        api_keys=_get_user_api_keys(user),
-        scoring_weights=_get_scoring_weights(user),
-    )
 
-    job_runner.submit(
-        orchestrator.run,
-        job_id=job.id,
-        category=request.category,
-        location=request.location,
-        num_results=request.num_results,
+@router.post("/batch", response_model=ScrapeJobResponse, status_code=status.HTTP_201_CREATED)
+def start_batch_scrape(
+    request: BatchScrapeRequest,
+    db: Annotated[Session, Depends(get_db)],
+    user: Annotated[User, Depends(get_current_user)],
+    job_runner: Annotated[JobRunner, Depends(get_job_runner)],
+):
+    """One job searching every category in every location, with leads deduplicated across searches."""
+    try:
+        queries = batch_queries(request.categories, request.sector, request.locations)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    categories = list(dict.fromkeys(q["category"] for q in queries))
+    locations = list(dict.fromkeys(q["location"] for q in queries))
+    job = ScrapeJob(
+        user_id=user.id,
+        category=(request.sector or ", ".join(categories))[:255],
+        location="; ".join(locations)[:255],
+        num_results_requested=request.num_results,
         delay=request.delay,
+        concurrency=request.concurrency,
+        freshness_days=request.freshness_days,
+        crawl_stop_when=",".join(request.stop_when),
+        queries_json=json.dumps(queries),
+        status=JobStatus.PENDING,
     )
+    return _create_and_submit(job, db, job_runner)
 
-    return job
+
+@router.post("/{job_id}/resume", response_model=ScrapeJobResponse)
+def resume_job(
+    job_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    user: Annotated[User, Depends(get_current_user)],
+    job_runner: Annotated[JobRunner, Depends(get_job_runner)],
+):
+    """Continue an interrupted or failed job from its checkpoint."""
+    job = db.query(ScrapeJob).filter(ScrapeJob.id == job_id, ScrapeJob.user_id == user.id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in RESUMABLE_STATUSES:
+        raise HTTPException(status_code=400, detail="Job is not resumable")
+    if job_runner.is_running(job.id):
+        raise HTTPException(status_code=409, detail="Job is already running")
+
+    try:
+        submit_scrape_job(db, job, job_runner)
+    except JobOwnedElsewhere:
+        raise HTTPException(status_code=409, detail="Job is already running")
+    except JobQueueFull:
+        raise _queue_full()
+    return _job_response(job, job_runner)
 
 
 @router.get("/{job_id}/status", response_model=ScrapeJobResponse)
@@ -82,11 +130,12 @@ def get_job_status(
     job_id: int,
     db: Annotated[Session, Depends(get_db)],
     user: Annotated[User, Depends(get_current_user)],
+    job_runner: Annotated[JobRunner, Depends(get_job_runner)],
 ):
     job = db.query(ScrapeJob).filter(ScrapeJob.id == job_id, ScrapeJob.user_id == user.id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    return _job_response(job, job_runner)
 
 
 @router.post("/{job_id}/cancel")
@@ -94,6 +143,8 @@ def cancel_job(
     job_id: int,
     db: Annotated[Session, Depends(get_db)],
     user: Annotated[User, Depends(get_current_user)],
+    job_runner: Annotated[JobRunner, Depends(get_job_runner)],
+    cancellations: Annotated[CancellationRegistry, Depends(get_cancellation_registry)],
 ):
     job = db.query(ScrapeJob).filter(ScrapeJob.id == job_id, ScrapeJob.user_id == user.id).first()
     if not job:
@@ -102,6 +153,9 @@ def cancel_job(
         raise HTTPException(status_code=400, detail="Job is not cancellable")
     job.status = JobStatus.CANCELLED
     db.commit()
+    # Drop it from the queue if it hasn't started, otherwise wake the running job right away
+    job_runner.cancel(JobHandle(job_id=job.id))
+    cancellations.cancel(job.id)
     return {"job_id": job.id, "status": job.status}
 
 
@@ -109,6 +163,7 @@ def cancel_job(
 def get_history(
     db: Annotated[Session, Depends(get_db)],
     user: Annotated[User, Depends(get_current_user)],
+    job_runner: Annotated[JobRunner, Depends(get_job_runner)],
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
 ):
@@ -117,8 +172,17 @@ def get_history(
     jobs = query.offset((page - 1) * per_page).limit(per_page).all()
 
     return {
-        "jobs": [ScrapeJobResponse.model_validate(j).model_dump() for j in jobs],
+        "jobs": [_job_response(j, job_runner).model_dump() for j in jobs],
         "total": total,
         "page": page,
         "per_page": per_page,
     }
+
+
+@router.get("/providers")
+def get_provider_stats(user: Annotated[User, Depends(get_current_user)]):
+    """Calls, latency, errors and current concurrency per search/enrichment API since startup.
+
+    Covers jobs run by this process; with ``JOB_QUEUE=database`` those run in the workers.
+    """
+    return provider_stats()
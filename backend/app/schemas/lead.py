@@ -25,6 +25,7 @@ class LeadResponse(BaseModel):
     compliance_mention: str
     ssl_valid: bool
     scrape_status: str
+    pages_fetched: int = 0
     hunter_email: str
     hunter_name: str
     hunter_confidence: Optional[int] = None
@@ -1,18 +1,40 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.models.scrape_job import JobStatus
 
+# Signals that can end a site's crawl early (app.scraper.crawl_policy.CRAWL_SIGNALS)
+CrawlSignal = Literal["email", "tech", "compliance", "it_mention"]
+
 
 class ScrapeRequest(BaseModel):
     category: str
     location: str
     num_results: int = 20
     delay: float = 1.5
+    concurrency: int = Field(5, ge=1, le=20)
+    # Reuse website/enrichment data for domains scraped within this many days (0 = always re-fetch)
+    freshness_days: float = Field(7, ge=0)
+    # Stop crawling a site's subpages once all of these are found (["email"] = stop after the first email)
+    stop_when: list[CrawlSignal] = []
+
+
+class BatchScrapeRequest(BaseModel):
+    """Search every category (or a whole sector from the verticals list) in every location as one job."""
+
+    categories: list[str] = []
+    sector: Optional[str] = None
+    locations: list[str] = Field(..., min_length=1)
+    num_results: int = 20  # per category/location search
+    delay: float = 1.5
+    concurrency: int = Field(5, ge=1, le=20)
+    freshness_days: float = Field(7, ge=0)
+    # Stop crawling a site's subpages once all of these are found (["email"] = stop after the first email)
+    stop_when: list[CrawlSignal] = []
 
 
 class ScrapeJobResponse(BaseModel):
@@ -20,11 +42,18 @@ class ScrapeJobResponse(BaseModel):
     category: str
     location: str
     num_results_requested: int
+    concurrency: int = 5
+    queries: list[dict] = []
+    stop_when: list[str] = []
     status: JobStatus
     lead_count: int
     error_message: Optional[str] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
+    stats: dict = {}
+    profile: dict = {}
+    # Set while the job waits for a free slot (1 = starts next)
+    queue_position: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
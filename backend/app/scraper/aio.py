@@ -0,0 +1,386 @@
+"""Async counterparts of the search, website and enrichment functions.
+
+Each function mirrors its sync twin in ``search``, ``website`` and ``enrichment``
+and reuses their request builders and response parsers, so both engines stay in
+lockstep. All network I/O goes through a caller-owned ``httpx.AsyncClient``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import time
+
+import httpx
+
+from app.config import settings
+from app.scraper.constants import GEOCODE_HEADERS, HEADERS
+from app.scraper.enrichment import (
+    APOLLO_ORG_ENRICH_URL,
+    APOLLO_PEOPLE_SEARCH_URL,
+    HUNTER_DOMAIN_SEARCH_URL,
+    _apollo_people_query,
+    _apply_apollo_org,
+    _apply_apollo_people,
+    _apply_hunter_emails,
+    _empty_apollo_result,
+    _empty_hunter_result,
+)
+from app.scraper.profiling import StageProfiler
+from app.scraper.providers import get_provider
+from app.scraper.search import (
+    NOMINATIM_URL,
+    SERPAPI_URL,
+    SERPER_MAPS_URL,
+    _coords_from_geocode,
+    _geocode_params,
+    _serpapi_params,
+    _serper_payload,
+)
+from app.scraper.context import CrawlContext
+from app.scraper.page_cache import conditional_headers, response_validators
+from app.scraper.robots import ROBOTS_MAX_BYTES, robots_url
+from app.scraper.website import (
+    _CHUNK_SIZE,
+    _PAGE_RETRIES,
+    HostUnreachable,
+    NotHtml,
+    RobotsDisallowed,
+    SiteCrawl,
+    host_down,
+    is_html,
+    probe_address,
+    record_fetch_error,
+    record_robots,
+    record_unreachable,
+    robots_verdict,
+    wants_probe,
+)
+
+log = logging.getLogger(__name__)
+
+
+async def _request_with_retry(
+    client: httpx.AsyncClient, url: str, max_retries: int = 3, timeout: int = 10,
+    stream: bool = False, headers: dict | None = None,
+) -> httpx.Response:
+    """GET with exponential backoff on 429/5xx.
+
+    With ``stream`` the body is left unread; the caller must ``aclose()`` the response.
+    """
+    resp = None
+    for attempt in range(max_retries):
+        try:
+            request = client.build_request("GET", url, headers={**HEADERS, **(headers or {})}, timeout=timeout)
+            resp = await client.send(request, stream=stream, follow_redirects=True)
+            if resp.status_code in (429, 500, 502, 503, 504) and attempt < max_retries - 1:
+                wait = 2 ** (attempt + 1)
+                log.warning(f"Got {resp.status_code} for {url}, retrying in {wait}s...")
+                await resp.aclose()
+                await asyncio.sleep(wait)
+                continue
+            if resp.status_code >= 400:
+                # httpx also raises for 3xx; a 304 to a conditional request is an answer
+                await resp.aclose()
+                resp.raise_for_status()
+            return resp
+        except httpx.TransportError:
+            if attempt < max_retries - 1:
+                await asyncio.sleep(2 ** (attempt + 1))
+            else:
+                raise
+    return resp
+
+
+async def fetch_page(
+    client: httpx.AsyncClient, url: str, cached: dict | None = None,
+) -> tuple[bytes | None, str | None, bool, dict]:
+    """Stream one page; returns (body, encoding, truncated, validators) or raises NotHtml.
+
+    The body is None when the conditional request for a ``cached`` page gets a 304.
+    """
+    resp = await _request_with_retry(
+        client, url, max_retries=_PAGE_RETRIES, timeout=10, stream=True, headers=conditional_headers(cached),
+    )
+    try:
+        validators = response_validators(resp.headers)
+        if resp.status_code == 304:
+            return None, None, False, validators
+        content_type = resp.headers.get("Content-Type")
+        if not is_html(content_type):
+            raise NotHtml(content_type)
+        max_bytes = settings.max_page_bytes
+        body = bytearray()
+        async for chunk in resp.aiter_bytes(_CHUNK_SIZE):
+            body += chunk
+            if max_bytes and len(body) > max_bytes:
+                return bytes(body[:max_bytes]), resp.encoding, True, validators
+        return bytes(body), resp.encoding, False, validators
+    finally:
+        await resp.aclose()
+
+
+async def probe_host(url: str, timeout: float):
+    """Resolve the site's host and open (then close) one TCP connection; raises HostUnreachable."""
+    host, port = probe_address(url)
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except socket.gaierror as e:
+        raise HostUnreachable("dns_error", str(e)) from e
+    except OSError as e:
+        # Includes the timeout
+        raise HostUnreachable("connect_error", str(e) or type(e).__name__) from e
+    writer.close()
+
+
+async def _probe_site(crawl: SiteCrawl, ctx: CrawlContext):
+    if not wants_probe(crawl):
+        return
+    started = time.perf_counter()
+    try:
+        with ctx.profiler.stage("probe"):
+            await probe_host(crawl.url, settings.host_probe_timeout)
+    except HostUnreachable as e:
+        record_unreachable(crawl, ctx, e, time.perf_counter() - started)
+
+
+async def _fetch_robots(client: httpx.AsyncClient, page_url: str, ctx: CrawlContext) -> tuple[int | None, bytes]:
+    url = robots_url(page_url)
+    await asyncio.sleep(ctx.throttle.reserve(url))
+    try:
+        with ctx.profiler.stage("robots") as stage:
+            async with client.stream("GET", url, headers=HEADERS, timeout=5, follow_redirects=True) as resp:
+                body = bytearray()
+                async for chunk in resp.aiter_bytes(_CHUNK_SIZE):
+                    body += chunk
+                    if len(body) > ROBOTS_MAX_BYTES:
+                        break
+            stage.add_bytes(len(body))
+    except httpx.HTTPError:
+        return None, b""
+    return resp.status_code, bytes(body)
+
+
+async def _robots_allow(client: httpx.AsyncClient, page_url: str, ctx: CrawlContext) -> bool:
+    allowed = robots_verdict(page_url, ctx)
+    if allowed is None:
+        allowed = record_robots(page_url, ctx, *await _fetch_robots(client, page_url, ctx))
+    return allowed
+
+
+def _record_fetch_error(crawl: SiteCrawl, page_url: str, error: Exception, ctx: CrawlContext):
+    record_fetch_error(
+        crawl, page_url, error, ctx,
+        status=error.response.status_code if isinstance(error, httpx.HTTPStatusError) else None,
+        no_response=isinstance(error, httpx.TransportError),
+    )
+
+
+async def scrape_website(
+    client: httpx.AsyncClient, url: str, ctx: CrawlContext | None = None,
+) -> dict:
+    """Cancellation arrives as task cancellation, which aborts in-flight requests."""
+    ctx = ctx or CrawlContext()
+    crawl = SiteCrawl(url, ctx.policy, ctx.pages)
+    if url:
+        refused = host_down(url, ctx)
+        if refused is not None:
+            crawl.add_error(url, refused)
+        else:
+            await _probe_site(crawl, ctx)
+    while (page_url := crawl.next_url()) is not None:
+        if page_url != url and (refused := host_down(page_url, ctx)) is not None:
+            crawl.add_error(page_url, refused)
+            continue
+        try:
+            if not await _robots_allow(client, page_url, ctx):
+                crawl.add_error(page_url, RobotsDisallowed(page_url))
+                continue
+            await asyncio.sleep(ctx.throttle.reserve(page_url))
+            with ctx.profiler.stage("fetch") as stage:
+                content, encoding, truncated, validators = await fetch_page(
+                    client, page_url, crawl.cached(page_url),
+                )
+                stage.add_bytes(len(content or b""))
+            ctx.breaker.record_success(page_url)
+            # Parsing is CPU-bound; keep it off the event loop
+            crawl.add_page(page_url, content, encoding, truncated, validators)
+            with ctx.profiler.stage("parse"):
+                await asyncio.to_thread(crawl.parse)
+        except Exception as e:
+            _record_fetch_error(crawl, page_url, e, ctx)
+    ctx.stats.add(
+        subpage_requests_saved=crawl.requests_saved, subpages_skipped=crawl.pages_skipped,
+        pages_not_modified=crawl.pages_not_modified, pages_unchanged=crawl.pages_unchanged,
+    )
+    return crawl.finish()
+
+
+async def _geocode_location(
+    client: httpx.AsyncClient, location: str, profiler: StageProfiler, geocoded: dict | None = None,
+) -> str:
+    if geocoded is not None and location in geocoded:
+        return geocoded[location]
+    coords = ""
+    with profiler.stage("geocode") as stage:
+        try:
+            resp = await client.get(
+                NOMINATIM_URL, params=_geocode_params(location), headers=GEOCODE_HEADERS, timeout=10,
+            )
+            stage.add_bytes(len(resp.content))
+            resp.raise_for_status()
+            coords = _coords_from_geocode(resp.json())
+        except Exception as e:
+            stage.error()
+            log.warning(f"Geocoding failed for '{location}': {e}")
+    if geocoded is not None:
+        geocoded[location] = coords
+    return coords
+
+
+async def _search_serper(
+    client: httpx.AsyncClient, query: str, location: str, num_results: int, serper_key: str,
+    profiler: StageProfiler, geocoded: dict | None = None,
+) -> list:
+    coords = await _geocode_location(client, location, profiler, geocoded)
+    results = []
+    page = 1
+
+    while len(results) < num_results:
+        with profiler.stage("search") as stage:
+            try:
+                resp = await get_provider("serper").request_async(
+                    client, "POST", SERPER_MAPS_URL,
+                    headers={"X-API-KEY": serper_key, "Content-Type": "application/json"},
+                    json=_serper_payload(query, location, coords, page), timeout=15,
+                )
+                stage.add_bytes(len(resp.content))
+                resp.raise_for_status()
+                places = resp.json().get("places", [])
+            except Exception as e:
+                stage.error()
+                log.error(f"Serper error: {e}")
+                break
+        if not places:
+            break
+        results.extend(places)
+        page += 1
+
+    return results[:num_results]
+
+
+async def _search_serpapi(
+    client: httpx.AsyncClient, query: str, location: str, num_results: int, serpapi_key: str,
+    profiler: StageProfiler,
+) -> list:
+    results = []
+    start = 0
+
+    while len(results) < num_results:
+        with profiler.stage("search") as stage:
+            try:
+                resp = await get_provider("serpapi").request_async(
+                    client, "GET", SERPAPI_URL, params=_serpapi_params(query, location, serpapi_key, start),
+                    timeout=15,
+                )
+                stage.add_bytes(len(resp.content))
+                resp.raise_for_status()
+                places = resp.json().get("local_results", [])
+            except Exception as e:
+                stage.error()
+                log.error(f"SerpAPI error: {e}")
+                break
+        if not places:
+            break
+        results.extend(places)
+        start += len(places)
+
+    return results[:num_results]
+
+
+async def search_google_places(
+    client: httpx.AsyncClient,
+    query: str,
+    location: str,
+    num_results: int = 20,
+    serper_key: str = "",
+    serpapi_key: str = "",
+    profiler: StageProfiler | None = None,
+    geocoded: dict | None = None,
+) -> list:
+    """Auto-detect which API to use: Serper > SerpAPI > mock."""
+    from app.scraper.mock import mock_places
+
+    profiler = profiler or StageProfiler()
+    if serper_key:
+        log.info("Using Serper.dev for Google Maps search")
+        return await _search_serper(client, query, location, num_results, serper_key, profiler, geocoded)
+    elif serpapi_key:
+        log.info("Using SerpAPI for Google Maps search")
+        return await _search_serpapi(client, query, location, num_results, serpapi_key, profiler)
+    else:
+        log.warning("No API key set. Using mock data.")
+        return mock_places(query, location)
+
+
+async def enrich_email_hunter(
+    client: httpx.AsyncClient, domain: str, hunter_key: str = "", profiler: StageProfiler | None = None,
+) -> dict:
+    result = _empty_hunter_result()
+
+    if not hunter_key or not domain:
+        return result
+
+    profiler = profiler or StageProfiler()
+    with profiler.stage("hunter") as stage:
+        try:
+            params = {"domain": domain, "api_key": hunter_key, "limit": 3}
+            resp = await get_provider("hunter").request_async(
+                client, "GET", HUNTER_DOMAIN_SEARCH_URL, params=params, timeout=10,
+            )
+            stage.add_bytes(len(resp.content))
+            resp.raise_for_status()
+            _apply_hunter_emails(result, resp.json().get("data", {}).get("emails", []))
+        except Exception as e:
+            stage.error()
+            log.warning(f"Hunter.io error for {domain}: {e}")
+
+    return result
+
+
+async def enrich_apollo(
+    client: httpx.AsyncClient, domain: str, apollo_key: str = "", profiler: StageProfiler | None = None,
+) -> dict:
+    result = _empty_apollo_result()
+
+    if not apollo_key or not domain:
+        return result
+
+    profiler = profiler or StageProfiler()
+    with profiler.stage("apollo") as stage:
+        try:
+            apollo = get_provider("apollo")
+            resp = await apollo.request_async(
+                client, "POST", APOLLO_ORG_ENRICH_URL,
+                headers={"Content-Type": "application/json"},
+                json={"api_key": apollo_key, "domain": domain},
+                timeout=10,
+            )
+            stage.add_bytes(len(resp.content))
+            resp.raise_for_status()
+            _apply_apollo_org(result, resp.json().get("organization", {}))
+
+            people_resp = await apollo.request_async(
+                client, "POST", APOLLO_PEOPLE_SEARCH_URL,
+                headers={"Content-Type": "application/json"},
+                json=_apollo_people_query(domain, apollo_key),
+                timeout=10,
+            )
+            stage.add_bytes(len(people_resp.content))
+            people_resp.raise_for_status()
+            _apply_apollo_people(result, people_resp.json().get("people", []))
+        except Exception as e:
+            stage.error()
+            log.warning(f"Apollo.io error for {domain}: {e}")
+
+    return result
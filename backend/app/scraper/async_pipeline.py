@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import httpx
+
+from app.config import settings
+from app.models.scrape_job import ScrapeJob
+from app.scraper import aio
+from app.scraper.context import CrawlContext
+from app.scraper.crawl_policy import CrawlPolicy
+from app.scraper.persistence import LeadWriter
+from app.scraper.pipeline import ScrapeOrchestrator
+from app.scraper.scoring import score_lead
+from app.scraper.throttle import HostThrottle
+
+log = logging.getLogger(__name__)
+
+
+class AsyncScrapeOrchestrator(ScrapeOrchestrator):
+    """Same pipeline as ScrapeOrchestrator, run as a coroutine on a shared event loop.
+
+    Places are processed as tasks bounded by a semaphore instead of worker
+    threads, so hundreds of sites can be in flight at once. Job bookkeeping
+    (status, dedup, persistence, events) is inherited unchanged, but every
+    call into it goes through ``_db``: the loop is shared by all jobs, and a
+    single database lock wait on it would stall every site in flight.
+    """
+
+    async def _db(self, func, *args):
+        """Run blocking work on the job's session in a worker thread.
+
+        The session is used by one thread at a time: when the job is cancelled
+        mid-call, the cancel waits for the call to finish before ``_cancel``
+        touches the session.
+        """
+        call = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        try:
+            return await asyncio.shield(call)
+        except asyncio.CancelledError:
+            await asyncio.wait({call})
+            raise
+
+    def _record(self, writer: LeadWriter, job_id: int, total: int, i: int, lead_data: dict):
+        writer.add(lead_data, i)
+        self._emit_processed(job_id, len(writer.done), total, lead_data)
+
+    async def run_async(
+        self,
+        job_id: int,
+        category: str,
+        location: str,
+        num_results: int = 20,
+        delay: float = 1.5,
+        concurrency: int = 5,
+    ):
+        job = await self._db(self._start, job_id, category, location)
+        writer = await self._db(LeadWriter, self.db, job, settings.persist_batch_size, self.profiler)
+        if self.cancel_token.cancelled:
+            await self._db(self._cancel, job, writer)
+            return
+        # Read once here; later commits expire the job and reloading would query on the loop
+        queries, stop_when = await self._db(lambda: (job.queries, job.crawl_stop_when))
+
+        # Cancelling the token cancels this task, aborting every in-flight request at once
+        task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        self.cancel_token.add_callback(lambda: loop.call_soon_threadsafe(task.cancel))
+
+        try:
+            limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency)
+            async with httpx.AsyncClient(limits=limits) as client:
+                places = await self._db(self._checkpointed_places, job, writer)
+                if places is None:
+                    places = await self._search_async(client, job_id, queries, num_results)
+                    await self._db(self._checkpoint_places, job, places)
+                    await self._db(self._emit, job_id, "search_complete", {"count": len(places)})
+
+                prepared = await self._db(self._prepare_places, job, places)
+                todo = [(i, lead) for i, lead in prepared if i not in writer.done]
+                if not todo:
+                    await self._db(self._complete, job, writer)
+                    return
+
+                ctx = CrawlContext(
+                    throttle=HostThrottle(delay, settings.host_burst), cancel_token=self.cancel_token,
+                    profiler=self.profiler, stats=self.crawl_stats,
+                    policy=CrawlPolicy.parse(stop_when), breaker=self.breaker, robots=self.robots,
+                    pages=self.pages,
+                )
+                semaphore = asyncio.Semaphore(max(1, concurrency))
+
+                async def process(i: int, lead_data: dict) -> tuple[int, dict]:
+                    async with semaphore:
+                        return i, await self._process_place_async(client, lead_data, ctx)
+
+                tasks = [asyncio.ensure_future(process(i, lead)) for i, lead in todo]
+                try:
+                    for next_finished in asyncio.as_completed(tasks):
+                        i, lead_data = await next_finished
+                        await self._db(self._record, writer, job_id, len(places), i, lead_data)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+
+            await self._db(self._complete, job, writer)
+
+        except asyncio.CancelledError:
+            await self._db(self._cancel, job, writer)
+        except Exception as e:
+            await self._db(self._fail, job, e, writer)
+
+    async def _search_async(
+        self, client: httpx.AsyncClient, job_id: int, queries: list[dict], num_results: int,
+    ) -> list:
+        geocoded = {}
+        places = []
+        for n, query in enumerate(queries, start=1):
+            await self._db(self._emit, job_id, "searching", {**query, "query": n, "queries": len(queries)})
+            places += await aio.search_google_places(
+                client, query["category"], query["location"], num_results,
+                serper_key=self.api_keys.get("serper_key", ""),
+                serpapi_key=self.api_keys.get("serpapi_key", ""),
+                profiler=self.profiler,
+                geocoded=geocoded,
+            )
+        return places
+
+    async def _process_place_async(self, client: httpx.AsyncClient, lead_data: dict, ctx: CrawlContext) -> dict:
+        if lead_data.get("reused"):
+            lead_data["score"] = score_lead(lead_data, self.scoring_weights)
+            return lead_data
+
+        website_data = await aio.scrape_website(client, lead_data["website"], ctx=ctx)
+        lead_data.update(website_data)
+
+        domain = lead_data["domain"]
+
+        hunter_data, apollo_data = await asyncio.gather(
+            aio.enrich_email_hunter(client, domain, self.api_keys.get("hunter_key", ""), self.profiler),
+            aio.enrich_apollo(client, domain, self.api_keys.get("apollo_key", ""), self.profiler),
+        )
+        lead_data.update(hunter_data)
+        lead_data.update(apollo_data)
+
+        with self.profiler.stage("score"):
+            lead_data["score"] = score_lead(lead_data, self.scoring_weights)
+        return lead_data
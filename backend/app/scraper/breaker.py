@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+from app.scraper.dedup import normalize_domain
+
+
+@dataclass
+class _Circuit:
+    failures: int = 0
+    opened_at: float | None = None
+    trial: bool = False
+    reason: str = ""
+
+
+class HostBreaker:
+    """Thread-safe per-job circuit breaker keyed by normalized domain.
+
+    A host's circuit opens after ``max_failures`` consecutive failed page
+    fetches (connection errors, 5xx), or at once when its probe fails. While
+    open, ``check`` refuses the host immediately instead of letting another
+    fetch go through retries and backoff. After ``cooldown`` seconds one trial
+    fetch is let through: success closes the circuit, failure reopens it.
+
+    Hosts preloaded from the negative cache (``preload``) stay refused for the
+    whole job; hosts that opened during the job are reported by ``dead_hosts``
+    so the job can add them to that cache.
+    """
+
+    def __init__(self, max_failures: int = 2, cooldown: float = 300.0):
+        self.max_failures = max(1, max_failures)
+        self.cooldown = cooldown
+        self._circuits: dict[str, _Circuit] = {}
+        self._known_dead: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def preload(self, dead: dict[str, str]):
+        """Refuse these domains (domain -> reason) for the rest of the job."""
+        with self._lock:
+            self._known_dead.update(dead)
+
+    def check(self, url: str) -> str | None:
+        """None if the URL's host may be fetched, else why it is considered down."""
+        host = normalize_domain(url)
+        with self._lock:
+            if host in self._known_dead:
+                return self._known_dead[host]
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.opened_at is None:
+                return None
+            if not circuit.trial and time.monotonic() - circuit.opened_at >= self.cooldown:
+                circuit.trial = True
+                return None
+            return circuit.reason
+
+    def record_success(self, url: str):
+        with self._lock:
+            self._circuits.pop(normalize_domain(url), None)
+
+    def record_failure(self, url: str, reason: str):
+        host = normalize_domain(url)
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _Circuit())
+            circuit.failures += 1
+            circuit.reason = reason
+            if circuit.trial or circuit.failures >= self.max_failures:
+                circuit.opened_at = time.monotonic()
+            circuit.trial = False
+
+    def mark_dead(self, url: str, reason: str):
+        """Open the host's circuit now, e.g. after a failed probe."""
+        host = normalize_domain(url)
+        with self._lock:
+            self._circuits[host] = _Circuit(self.max_failures, time.monotonic(), False, reason)
+
+    def dead_hosts(self) -> dict[str, str]:
+        """Domains whose circuit is open at the end of the job, with the reason."""
+        with self._lock:
+            return {
+                host: circuit.reason for host, circuit in self._circuits.items()
+                if host and circuit.opened_at is not None
+            }
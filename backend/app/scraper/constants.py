@@ -8,7 +8,15 @@ HEADERS = {
     )
 }
 
-# Subpages to check for emails and signals
+# Nominatim's usage policy requires an identifying User-Agent
+GEOCODE_HEADERS = {"User-Agent": "MSPLeadScraper/2.0"}
+
+# Homepage links whose URL or text mentions one of these are crawled as
+# subpages (contact pages first), at most MAX_SUBPAGES per site
+SUBPAGE_KEYWORDS = ("contact", "about")
+MAX_SUBPAGES = 3
+
+# Subpages probed when the homepage links to none
 EXTRA_PATHS = ["/contact", "/contact-us", "/about", "/about-us"]
 
 # ── Tech Stack Detection Signals ─────────────────────────────────────────────
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+from app.jobs.cancellation import CancellationToken
+from app.scraper.breaker import HostBreaker
+from app.scraper.crawl_policy import CrawlPolicy
+from app.scraper.robots import RobotsCache
+from app.scraper.http_pool import HttpPool
+from app.scraper.page_cache import PageCache
+from app.scraper.profiling import StageProfiler
+from app.scraper.throttle import HostThrottle
+
+
+class CrawlStats:
+    """Thread-safe per-job totals reported by site crawls, merged into the job's stats."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, **counts: int):
+        with self._lock:
+            self._counts.update(counts)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+@dataclass
+class CrawlContext:
+    """Per-job collaborators shared by every site crawl in a job."""
+
+    throttle: HostThrottle = field(default_factory=lambda: HostThrottle(0))
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
+    profiler: StageProfiler = field(default_factory=StageProfiler)
+    # Keep-alive session for page fetches; None fetches with one-off connections
+    http: HttpPool | None = None
+    stats: CrawlStats = field(default_factory=CrawlStats)
+    policy: CrawlPolicy = field(default_factory=CrawlPolicy)
+    breaker: HostBreaker = field(default_factory=HostBreaker)
+    robots: RobotsCache = field(default_factory=RobotsCache)
+    pages: PageCache = field(default_factory=PageCache)
+
+    def check_cancelled(self):
+        self.cancel_token.raise_if_cancelled()
+
+    def sleep(self, seconds: float):
+        """Backoff/politeness sleep that aborts with JobCancelled when the job is cancelled."""
+        self.cancel_token.sleep(seconds)
+
+    def wait_for_host(self, url: str):
+        self.sleep(self.throttle.reserve(url))
+
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# Signals a crawl policy can wait for, as accepted by ScrapeRequest.stop_when
+CRAWL_SIGNALS = ("email", "tech", "compliance", "it_mention")
+
+
+@dataclass(frozen=True)
+class CrawlPolicy:
+    """When a site crawl may stop before fetching every subpage.
+
+    The crawl stops once every signal in ``stop_when`` has been found on the
+    pages fetched so far, so ``{"email"}`` stops after the first page with an
+    address. An empty ``stop_when`` crawls every subpage.
+    """
+
+    stop_when: frozenset[str] = frozenset()
+
+    @classmethod
+    def parse(cls, value: str | None) -> CrawlPolicy:
+        """From the comma-separated form stored in ``ScrapeJob.crawl_stop_when``."""
+        return cls(frozenset(s for s in (value or "").split(",") if s in CRAWL_SIGNALS))
+
+    def satisfied(self, found: set[str]) -> bool:
+        return bool(self.stop_when) and self.stop_when <= found
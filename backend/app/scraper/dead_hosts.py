@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.services.cache_service import CacheService
+
+# Cross-job negative cache: domains found unreachable, skipped by later jobs
+# until their entry expires
+DEAD_HOST_CACHE = "dead_host"
+
+
+def _key(domain: str) -> str:
+    return f"{DEAD_HOST_CACHE}:{domain}"
+
+
+def known_dead_hosts(db: Session, domains: list[str]) -> dict[str, str]:
+    """Domains with an unexpired negative-cache entry, mapped to why they were unreachable."""
+    cached = CacheService(db).get_many([_key(d) for d in domains])
+    return {d: cached[_key(d)]["reason"] for d in domains if _key(d) in cached}
+
+
+def remember_dead_hosts(db: Session, dead: dict[str, str], ttl_hours: float):
+    CacheService(db).set_many({_key(d): {"reason": r} for d, r in dead.items()}, DEAD_HOST_CACHE, ttl_hours)
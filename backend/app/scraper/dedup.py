@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+
+from app.scraper.throttle import host_of
+
+# Fields filled in from a duplicate when the kept place lacks them
+_MERGE_FIELDS = ("category", "address", "phone", "rating", "reviews", "google_maps_url")
+
+_NAME_NOISE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_domain(website: str) -> str:
+    """'https://WWW.Example.com:443/about' -> 'example.com'."""
+    if not website:
+        return ""
+    if "://" not in website:
+        website = "http://" + website
+    return host_of(website).split(":")[0].rstrip(".")
+
+
+def normalize_name(name: str) -> str:
+    """Case- and punctuation-insensitive business name key."""
+    return _NAME_NOISE.sub(" ", (name or "").lower()).strip()
+
+
+def _place_keys(lead: dict, name: str) -> list[tuple[str, ...]]:
+    """Keys that identify a place apart from its website: its Maps id, and its
+    name at its address. A name alone is not enough, since different businesses
+    in different cities share names like "Tech Solutions"."""
+    keys = []
+    if lead.get("google_maps_url"):
+        keys.append(("maps", lead["google_maps_url"]))
+    address = normalize_name(lead.get("address", ""))
+    if name and address:
+        keys.append(("name", name, address))
+    return keys
+
+
+def dedupe_places(leads: list[dict]) -> tuple[list[tuple[int, dict]], int]:
+    """Merge parsed places that point at the same business before any network work.
+
+    Places with a website are keyed by normalized domain; places without one are
+    matched against everything seen so far by Maps id, or by normalized name at
+    the same address (a place with neither is never merged). The first
+    occurrence (best search rank) is kept and gaps in its fields are filled from
+    its duplicates. Returns ``(index, lead)`` pairs, indexed by position in the
+    input so checkpoints stay stable, plus the number of sites whose crawl and
+    enrichment were skipped.
+    """
+    kept: list[tuple[int, dict]] = []
+    by_domain: dict[str, dict] = {}
+    by_place: dict[tuple[str, ...], dict] = {}
+    fetches_saved = 0
+
+    for i, lead in enumerate(leads):
+        domain = lead.get("domain") or normalize_domain(lead.get("website", ""))
+        lead["domain"] = domain
+        keys = _place_keys(lead, normalize_name(lead.get("business_name", "")))
+
+        if domain:
+            original = by_domain.get(domain)
+        else:
+            original = next((by_place[key] for key in keys if key in by_place), None)
+        if original is not None:
+            for field in _MERGE_FIELDS:
+                if original.get(field) in (None, "") and lead.get(field) not in (None, ""):
+                    original[field] = lead[field]
+            if domain:
+                fetches_saved += 1
+            continue
+
+        kept.append((i, lead))
+        if domain:
+            by_domain[domain] = lead
+        for key in keys:
+            by_place.setdefault(key, lead)
+
+    return kept, fetches_saved
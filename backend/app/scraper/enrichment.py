@@ -1,49 +1,28 @@
 from __future__ import annotations
 
 import logging
+from typing import Callable
 
-import requests
+from app.jobs.cancellation import JobCancelled
+from app.scraper.profiling import StageProfiler
+from app.scraper.providers import get_provider
 
 log = logging.getLogger(__name__)
 
+HUNTER_DOMAIN_SEARCH_URL = "https://api.hunter.io/v2/domain-search"
+APOLLO_ORG_ENRICH_URL = "https://api.apollo.io/v1/organizations/enrich"
+APOLLO_PEOPLE_SEARCH_URL = "https://api.apollo.io/v1/mixed_people/search"
 
-def enrich_email_hunter(domain: str, hunter_key: str = "") -> dict:
-    """Hunter.io domain search. Free tier: 25/month."""
-    result = {"hunter_email": "", "hunter_name": "", "hunter_confidence": None}
-
-    if not hunter_key or not domain:
-        return result
+_HUNTER_PRIORITY_TITLES = ["owner", "ceo", "president", "founder", "director", "manager"]
+_APOLLO_PERSON_TITLES = ["owner", "ceo", "president", "founder", "office manager"]
 
-    try:
-        params = {"domain": domain, "api_key": hunter_key, "limit": 3}
-        resp = requests.get("https://api.hunter.io/v2/domain-search", params=params, timeout=10)
-        resp.raise_for_status()
-        emails = resp.json().get("data", {}).get("emails", [])
-
-        if emails:
-            priority_titles = ["owner", "ceo", "president", "founder", "director", "manager"]
-            best = None
-            for e in emails:
-                pos = (e.get("position") or "").lower()
-                if any(t in pos for t in priority_titles):
-                    best = e
-                    break
-            if not best:
-                best = emails[0]
-
-            result["hunter_email"] = best.get("value", "")
-            result["hunter_name"] = f"{best.get('first_name', '')} {best.get('last_name', '')}".strip()
-            result["hunter_confidence"] = best.get("confidence")
-
-    except Exception as e:
-        log.warning(f"Hunter.io error for {domain}: {e}")
 
-    return result
+def _empty_hunter_result() -> dict:
+    return {"hunter_email": "", "hunter_name": "", "hunter_confidence": None}
 
 
-def enrich_apollo(domain: str, apollo_key: str = "") -> dict:
-    """Apollo.io enrichment. Free tier: 50 credits/month."""
-    result = {
+def _empty_apollo_result() -> dict:
+    return {
         "apollo_email": "",
         "apollo_name": "",
         "apollo_title": "",
@@ -51,44 +30,118 @@ def enrich_apollo(domain: str, apollo_key: str = "") -> dict:
         "industry": "",
     }
 
+
+def _apply_hunter_emails(result: dict, emails: list):
+    """Pick the most senior contact from a Hunter domain-search response."""
+    if not emails:
+        return
+    best = None
+    for e in emails:
+        pos = (e.get("position") or "").lower()
+        if any(t in pos for t in _HUNTER_PRIORITY_TITLES):
+            best = e
+            break
+    if not best:
+        best = emails[0]
+
+    result["hunter_email"] = best.get("value", "")
+    result["hunter_name"] = f"{best.get('first_name', '')} {best.get('last_name', '')}".strip()
+    result["hunter_confidence"] = best.get("confidence")
+
+
+def _apply_apollo_org(result: dict, org: dict):
+    result["company_size"] = str(org.get("estimated_num_employees", "")) if org.get("estimated_num_employees") else ""
+    result["industry"] = org.get("industry", "") or ""
+
+
+def _apply_apollo_people(result: dict, people: list):
+    if people:
+        p = people[0]
+        result["apollo_email"] = p.get("email", "") or ""
+        result["apollo_name"] = p.get("name", "") or ""
+        result["apollo_title"] = p.get("title", "") or ""
+
+
+def _apollo_people_query(domain: str, apollo_key: str) -> dict:
+    return {
+        "api_key": apollo_key,
+        "q_organization_domains": domain,
+        "person_titles": _APOLLO_PERSON_TITLES,
+        "page": 1,
+        "per_page": 1,
+    }
+
+
+def enrich_email_hunter(
+    domain: str, hunter_key: str = "", profiler: StageProfiler | None = None,
+    sleep: Callable[[float], None] | None = None,
+) -> dict:
+    """Hunter.io domain search. Free tier: 25/month."""
+    result = _empty_hunter_result()
+
+    if not hunter_key or not domain:
+        return result
+
+    profiler = profiler or StageProfiler()
+    with profiler.stage("hunter") as stage:
+        try:
+            params = {"domain": domain, "api_key": hunter_key, "limit": 3}
+            resp = get_provider("hunter").request(
+                "GET", HUNTER_DOMAIN_SEARCH_URL, sleep=sleep, params=params, timeout=10,
+            )
+            stage.add_bytes(len(resp.content))
+            resp.raise_for_status()
+            _apply_hunter_emails(result, resp.json().get("data", {}).get("emails", []))
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            stage.error()
+            log.warning(f"Hunter.io error for {domain}: {e}")
+
+    return result
+
+
+def enrich_apollo(
+    domain: str, apollo_key: str = "", profiler: StageProfiler | None = None,
+    sleep: Callable[[float], None] | None = None,
+) -> dict:
+    """Apollo.io enrichment. Free tier: 50 credits/month."""
+    result = _empty_apollo_result()
+
     if not apollo_key or not domain:
         return result
 
-    try:
-        # Organization enrichment
-        resp = requests.post(
-            "https://api.apollo.io/v1/organizations/enrich",
-            headers={"Content-Type": "application/json"},
-            json={"api_key": apollo_key, "domain": domain},
-            timeout=10,
-        )
-        resp.raise_for_status()
-        org = resp.json().get("organization", {})
-        result["company_size"] = str(org.get("estimated_num_employees", "")) if org.get("estimated_num_employees") else ""
-        result["industry"] = org.get("industry", "") or ""
-
-        # People search for decision maker
-        people_resp = requests.post(
-            "https://api.apollo.io/v1/mixed_people/search",
-            headers={"Content-Type": "application/json"},
-            json={
-                "api_key": apollo_key,
-                "q_organization_domains": domain,
-                "person_titles": ["owner", "ceo", "president", "founder", "office manager"],
-                "page": 1,
-                "per_page": 1,
-            },
-            timeout=10,
-        )
-        people_resp.raise_for_status()
-        people = people_resp.json().get("people", [])
-        if people:
-            p = people[0]
-            result["apollo_email"] = p.get("email", "") or ""
-            result["apollo_name"] = p.get("name", "") or ""
-            result["apollo_title"] = p.get("title", "") or ""
-
-    except Exception as e:
-        log.warning(f"Apollo.io error for {domain}: {e}")
+    profiler = profiler or StageProfiler()
+    with profiler.stage("apollo") as stage:
+        try:
+            # Organization enrichment
+            apollo = get_provider("apollo")
+            resp = apollo.request(
+                "POST", APOLLO_ORG_ENRICH_URL, sleep=sleep,
+                headers={"Content-Type": "application/json"},
+                json={"api_key": apollo_key, "domain": domain},
+                timeout=10,
+            )
+            stage.add_bytes(len(resp.content))
+            resp.raise_for_status()
+            _apply_apollo_org(result, resp.json().get("organization", {}))
+
+            # People search for decision maker
+            people_resp = apollo.request(
+                "POST", APOLLO_PEOPLE_SEARCH_URL, sleep=sleep,
+                headers={"Content-Type": "application/json"},
+                json=_apollo_people_query(domain, apollo_key),
+                timeout=10,
+            )
+            stage.add_bytes(len(people_resp.content))
+            people_resp.raise_for_status()
+            _apply_apollo_people(result, people_resp.json().get("people", []))
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            stage.error()
+            log.warning(f"Apollo.io error for {domain}: {e}")
 
     return result
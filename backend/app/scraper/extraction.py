@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import re
+import string
+
+from lxml import etree
+
+from app.scraper.constants import (
+    COMPLIANCE_KEYWORDS,
+    IT_KEYWORDS,
+    MSP_TOOL_SIGNALS,
+    SUBPAGE_KEYWORDS,
+    TECH_SIGNALS,
+)
+from app.scraper.signals import KEYWORD_MATCHER, TECH_MATCHER
+
+EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}")
+# Characters EMAIL_RE accepts before the "@"
+_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + "._%+-")
+# Obfuscated spellings of "@" undone before scanning the raw markup
+_AT_SPELLINGS = (" [at] ", "(at)", " AT ")
+
+JUNK_EMAIL_PATTERNS = (
+    "example", "domain", "youremail", "sentry", "wixpress", "schema",
+    "placeholder", "test@", "noreply", "no-reply",
+)
+_JUNK_RE = re.compile("|".join(re.escape(p) for p in JUNK_EMAIL_PATTERNS))
+
+# Elements whose content is never visible; their subtrees are skipped entirely
+_HIDDEN_TAGS = {"script", "style", "noscript"}
+_JSONLD_TYPE = "application/ld+json"
+
+_PARSER = etree.HTMLParser(recover=True, no_network=True)
+_UTF8_PARSER = etree.HTMLParser(recover=True, no_network=True, encoding="utf-8")
+
+
+def _parse(html: str) -> etree._Element | None:
+    try:
+        return etree.fromstring(html, _PARSER)
+    except ValueError:
+        # str input may not carry an XML encoding declaration; hand lxml bytes instead
+        return etree.fromstring(html.encode("utf-8"), _UTF8_PARSER)
+
+
+def find_emails(text: str) -> list[str]:
+    """Same matches as ``EMAIL_RE.findall(text)``, running the regex only at "@" signs.
+
+    Every match contains exactly one "@" and starts where the run of local-part
+    characters before it begins (or where the previous match ended), so text
+    without an "@" costs one ``str.find`` and the regex never scans word runs
+    that cannot lead to an address.
+    """
+    found = []
+    end = 0
+    at = text.find("@")
+    while at != -1:
+        start = at
+        while start > end and text[start - 1] in _LOCAL_CHARS:
+            start -= 1
+        if start < at:
+            match = EMAIL_RE.match(text, start)
+            if match:
+                found.append(match.group())
+                end = match.end()
+        at = text.find("@", max(at + 1, end))
+    return found
+
+
+def _extract_from_jsonld(data, emails: set):
+    """Recursively extract email fields from JSON-LD."""
+    if isinstance(data, dict):
+        for key in ("email", "contactPoint"):
+            if key in data:
+                val = data[key]
+                if isinstance(val, str) and "@" in val:
+                    emails.add(val.replace("mailto:", ""))
+                elif isinstance(val, (dict, list)):
+                    _extract_from_jsonld(val, emails)
+        for v in data.values():
+            if isinstance(v, (dict, list)):
+                _extract_from_jsonld(v, emails)
+    elif isinstance(data, list):
+        for item in data:
+            _extract_from_jsonld(item, emails)
+
+
+def detect_tech_stack(html: str) -> tuple:
+    """Returns (detected_techs: list, has_existing_msp: bool)."""
+    found = TECH_MATCHER.find(html.lower())
+    detected = [tech for tech, patterns in TECH_SIGNALS.items() if any(p in found for p in patterns)]
+    has_existing_msp = bool(set(detected) & MSP_TOOL_SIGNALS)
+    return detected, has_existing_msp
+
+
+def _has_subpage_keyword(text: str) -> bool:
+    text = text.lower()
+    return any(keyword in text for keyword in SUBPAGE_KEYWORDS)
+
+
+def _is_subpage_link(href: str, link: etree._Element) -> bool:
+    """By the href, else by the link's whole label, e.g. ``<a><span>Contact us</span></a>``."""
+    return _has_subpage_keyword(href) or _has_subpage_keyword("".join(link.itertext()))
+
+
+def _walk(root: etree._Element, emails: set, links: list | None = None) -> str:
+    """One traversal collecting visible text, mailto, meta and JSON-LD emails,
+    and (into ``links``) the hrefs of likely contact and about pages."""
+    text = []
+    in_template = 0
+    walker = etree.iterwalk(root, events=("start", "end", "comment", "pi"))
+    for event, el in walker:
+        if event in ("comment", "pi"):
+            if el.tail and not in_template:
+                text.append(el.tail)
+            continue
+
+        tag = el.tag
+        if event == "end":
+            if tag == "template":
+                in_template -= 1
+            if el.tail and not in_template:
+                text.append(el.tail)
+            continue
+
+        if tag in _HIDDEN_TAGS:
+            if tag == "script" and el.get("type") == _JSONLD_TYPE:
+                try:
+                    _extract_from_jsonld(json.loads(el.text or ""), emails)
+                except (json.JSONDecodeError, TypeError):
+                    pass
+            walker.skip_subtree()
+            continue
+
+        if tag == "template":
+            # Template content is inert markup: searched for links, not visible text
+            in_template += 1
+        elif tag == "a":
+            href = el.get("href")
+            if href and href.startswith("mailto:"):
+                email = href.replace("mailto:", "").split("?")[0].strip()
+                if "@" in email:
+                    emails.add(email)
+            elif href and links is not None and _is_subpage_link(href, el):
+                links.append(href.strip())
+        elif tag == "meta":
+            content = el.get("content")
+            if content:
+                emails.update(find_emails(content))
+
+        if el.text and not in_template:
+            text.append(el.text)
+
+    return " ".join(piece for piece in (t.strip() for t in text) if piece)
+
+
+def collect_emails(html: str, visible_text: str, emails: set) -> set:
+    """Add addresses from the visible text and de-obfuscated markup, then drop junk."""
+    emails.update(find_emails(visible_text))
+
+    deobfuscated = html
+    for spelling in _AT_SPELLINGS:
+        if spelling in deobfuscated:
+            deobfuscated = deobfuscated.replace(spelling, "@")
+    emails.update(find_emails(deobfuscated))
+
+    return {e for e in emails if not _JUNK_RE.search(e.lower())}
+
+
+def extract_page(content: bytes, encoding: str | None = None) -> dict:
+    """Parse one page into the small set of signals ``SiteCrawl`` aggregates.
+
+    The body is decoded once and parsed once with lxml; a single walk over the
+    tree yields the visible text, the emails in links, meta tags and JSON-LD,
+    and the hrefs of contact and about pages. Only plain data is returned, so
+    this can run in a parse process (see ``parse_pool``) without shipping trees
+    or page text between processes.
+    """
+    html = content.decode(encoding or "utf-8", errors="replace")
+    emails = set()
+    links = []
+    root = _parse(html)
+    visible_text = _walk(root, emails, links) if root is not None else ""
+
+    emails = collect_emails(html, visible_text, emails)
+
+    keywords = KEYWORD_MATCHER.find(visible_text.lower())
+    detected, _ = detect_tech_stack(html)
+    return {
+        "emails": sorted(emails),
+        "tech": detected,
+        "it_mention": any(kw in keywords for kw in IT_KEYWORDS),
+        "compliance": [kw for kw in COMPLIANCE_KEYWORDS if kw in keywords],
+        "links": list(dict.fromkeys(links)),
+    }
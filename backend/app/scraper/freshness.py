@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.models.lead import Lead
+from app.models.scrape_job import ScrapeJob
+
+# Lead fields produced by scrape_website and the enrichment APIs; everything a
+# fresh crawl would recompute except the score
+REUSED_FIELDS = (
+    "emails_found",
+    "tech_stack",
+    "has_it_mention",
+    "has_existing_msp",
+    "compliance_mention",
+    "ssl_valid",
+    "scrape_status",
+    "hunter_email",
+    "hunter_name",
+    "hunter_confidence",
+    "apollo_email",
+    "apollo_name",
+    "apollo_title",
+    "company_size",
+    "industry",
+)
+
+
+def recent_leads_by_domain(
+    db: Session, user_id: int, domains: list[str], max_age_days: float, exclude_job_id: int,
+) -> dict[str, Lead]:
+    """Newest successfully scraped lead per domain from the user's other jobs within the window."""
+    if not domains or max_age_days <= 0:
+        return {}
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    rows = (
+        db.query(Lead)
+        .join(ScrapeJob, Lead.job_id == ScrapeJob.id)
+        .filter(
+            ScrapeJob.user_id == user_id,
+            Lead.job_id != exclude_job_id,
+            Lead.domain.in_(domains),
+            Lead.scrape_status.in_(("ok", "truncated")),
+            Lead.created_at >= cutoff,
+        )
+        .order_by(Lead.created_at.desc())
+        .all()
+    )
+    latest: dict[str, Lead] = {}
+    for lead in rows:
+        latest.setdefault(lead.domain, lead)
+    return latest
+
+
+def apply_previous_scrape(lead_data: dict, previous: Lead):
+    """Copy website and enrichment results from an earlier lead for the same domain."""
+    for field in REUSED_FIELDS:
+        lead_data[field] = getattr(previous, field)
+    lead_data["reused"] = True
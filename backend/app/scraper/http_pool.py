@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from app.scraper.constants import HEADERS
+
+
+class ConnectionStats:
+    """Thread-safe count of HTTP requests and of the connections opened to serve them."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def add(self, requests: int = 0, connections: int = 0):
+        with self._lock:
+            self.requests += requests
+            self.connections += connections
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "http_requests": self.requests,
+                "http_connections": self.connections,
+                "http_connections_reused": max(0, self.requests - self.connections),
+            }
+
+
+def _counting_pool(base: type, stats: ConnectionStats) -> type:
+    class CountingPool(base):
+        def _new_conn(self):
+            stats.add(connections=1)
+            return super()._new_conn()
+
+        def urlopen(self, *args, **kwargs):
+            stats.add(requests=1)
+            return super().urlopen(*args, **kwargs)
+
+    return CountingPool
+
+
+class HttpPool:
+    """Keep-alive HTTP session shared by a job's fetch workers.
+
+    Connections stay open per host, so the homepage and extra pages of a site
+    reuse one TCP/TLS handshake. ``max_hosts`` is how many hosts keep idle
+    connections (least recently used are dropped) and ``per_host`` how many
+    connections each host may hold. Close the pool when the job ends.
+    """
+
+    def __init__(self, max_hosts: int = 100, per_host: int = 2):
+        self.stats = ConnectionStats()
+        adapter = HTTPAdapter(pool_connections=max(1, max_hosts), pool_maxsize=max(1, per_host))
+        adapter.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self.stats),
+            "https": _counting_pool(HTTPSConnectionPool, self.stats),
+        }
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self) -> HttpPool:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.scraper.dedup import normalize_domain
+from app.services.cache_service import CacheService
+
+# Cross-job cache of what each crawled page looked like: its validators,
+# content hash and extracted signals, keyed by domain and then by page URL
+PAGE_CACHE = "page"
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def response_validators(headers) -> dict:
+    """A response's ETag and Last-Modified, sent back when the page is fetched again."""
+    return {"etag": headers.get("ETag") or "", "last_modified": headers.get("Last-Modified") or ""}
+
+
+def conditional_headers(entry: dict | None) -> dict:
+    """If-None-Match / If-Modified-Since for re-fetching a page cached as ``entry``."""
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+class PageCache:
+    """Earlier crawls' pages for one job, shared by its fetch and parse workers.
+
+    An entry holds the page's validators, the hash of its body, whether the
+    body was truncated, and the signals ``extract_page`` found in it ("page").
+    ``preload`` seeds it from the cross-job cache; entries fetched or reused
+    during the job are kept for ``updated`` so the job can store them, which
+    lets pages a site no longer links to drop out of the cache.
+    """
+
+    def __init__(self):
+        self._pages: dict[str, dict[str, dict]] = {}
+        self._updated: dict[str, dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def preload(self, pages: dict[str, dict[str, dict]]):
+        """domain -> {page URL: entry} as stored by ``remember_pages``."""
+        with self._lock:
+            for domain, entries in pages.items():
+                self._pages.setdefault(domain, {}).update(entries)
+
+    def get(self, url: str) -> dict | None:
+        with self._lock:
+            return self._pages.get(normalize_domain(url), {}).get(url)
+
+    def put(self, url: str, entry: dict):
+        domain = normalize_domain(url)
+        with self._lock:
+            self._pages.setdefault(domain, {})[url] = entry
+            self._updated.setdefault(domain, {})[url] = entry
+
+    def updated(self) -> dict[str, dict[str, dict]]:
+        with self._lock:
+            return {domain: dict(entries) for domain, entries in self._updated.items()}
+
+
+def _key(domain: str) -> str:
+    return f"{PAGE_CACHE}:{domain}"
+
+
+def cached_pages(db: Session, domains: list[str]) -> dict[str, dict[str, dict]]:
+    """Unexpired page entries stored by earlier jobs, by domain and page URL."""
+    cached = CacheService(db).get_many([_key(d) for d in domains])
+    return {d: cached[_key(d)] for d in domains if _key(d) in cached}
+
+
+def remember_pages(db: Session, pages: dict[str, dict[str, dict]], ttl_hours: float):
+    CacheService(db).set_many({_key(d): entries for d, entries in pages.items()}, PAGE_CACHE, ttl_hours)
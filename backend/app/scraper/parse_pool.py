@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_parse_pool() -> ProcessPoolExecutor | None:
+    """Shared process pool for page parsing, or None to parse in the calling thread."""
+    global _pool
+    if settings.parse_processes <= 0:
+        return None
+    with _lock:
+        if _pool is None:
+            # spawn, not fork: the parent is multi-threaded (jobs, event loop, DB pool)
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.parse_processes, mp_context=multiprocessing.get_context("spawn"),
+            )
+            log.info(f"Started {settings.parse_processes} parse processes")
+        return _pool
+
+
+def discard_parse_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next caller starts a fresh one."""
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_parse_pool():
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import logging
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.lead import Lead
+from app.models.scrape_job import ScrapeJob
+from app.scraper.profiling import StageProfiler
+
+log = logging.getLogger(__name__)
+
+
+class LeadWriter:
+    """Dedups finished leads and bulk-inserts them in batches while a job runs.
+
+    Each batch is one INSERT plus one commit that also bumps ``job.lead_count``
+    and the job's checkpoint of finished place indexes, so partial results are
+    queryable mid-run and a crash loses at most one batch. A writer created for
+    a job that already has leads picks up its dedup state and checkpoint.
+    Only the job's own thread may call into the writer.
+    """
+
+    def __init__(
+        self, db: Session, job: ScrapeJob, batch_size: int = 25, profiler: StageProfiler | None = None,
+    ):
+        self.db = db
+        self.job = job
+        self.batch_size = max(1, batch_size)
+        self.profiler = profiler or StageProfiler()
+        self.done: set[int] = set(json.loads(job.done_places_json or "[]"))
+        self._pending: list[dict] = []
+        self._seen_domains: set[str] = set()
+        self._seen_names: set[str] = set()
+
+        existing = db.query(Lead.domain, Lead.business_name).filter(Lead.job_id == job.id).all()
+        for domain, name in existing:
+            if domain:
+                self._seen_domains.add(domain)
+            self._seen_names.add(name)
+        self.written = len(existing)
+
+    def add(self, lead_data: dict, place_index: int) -> bool:
+        """Queue a lead for insertion and mark its place done. Returns False if it
+        duplicates an earlier lead."""
+        self.done.add(place_index)
+        d = lead_data.get("domain", "")
+        n = lead_data.get("business_name", "")
+        if d and d in self._seen_domains:
+            return False
+        if not d and n in self._seen_names:
+            return False
+        if d:
+            self._seen_domains.add(d)
+        self._seen_names.add(n)
+
+        self._pending.append(self.to_model_fields(lead_data))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        with self.profiler.stage("db"):
+            if self._pending:
+                rows = [{"job_id": self.job.id, **row} for row in self._pending]
+                self.db.execute(insert(Lead), rows)
+                self.written += len(rows)
+            self.job.lead_count = self.written
+            self.job.done_places_json = json.dumps(sorted(self.done))
+            self.job.profile_json = json.dumps(self.profiler.snapshot())
+            self.db.commit()
+            self._pending = []
+
+    @staticmethod
+    def to_model_fields(data: dict) -> dict:
+        return {
+            "business_name": data.get("business_name", ""),
+            "category": data.get("category", ""),
+            "address": data.get("address", ""),
+            "phone": data.get("phone", ""),
+            "website": data.get("website", ""),
+            "domain": data.get("domain", ""),
+            "rating": data.get("rating"),
+            "reviews": data.get("reviews"),
+            "google_maps_url": data.get("google_maps_url", ""),
+            "emails_found": data.get("emails_found", ""),
+            "tech_stack": data.get("tech_stack", ""),
+            "has_it_mention": data.get("has_it_mention", False),
+            "has_existing_msp": data.get("has_existing_msp", False),
+            "compliance_mention": data.get("compliance_mention", ""),
+            "ssl_valid": data.get("ssl_valid", False),
+            "scrape_status": data.get("scrape_status", ""),
+            "pages_fetched": data.get("pages_fetched", 0),
+            "hunter_email": data.get("hunter_email", ""),
+            "hunter_name": data.get("hunter_name", ""),
+            "hunter_confidence": data.get("hunter_confidence"),
+            "apollo_email": data.get("apollo_email", ""),
+            "apollo_name": data.get("apollo_name", ""),
+            "apollo_title": data.get("apollo_title", ""),
+            "company_size": data.get("company_size", ""),
+            "industry": data.get("industry", ""),
+            "score": data.get("score", 0),
+        }
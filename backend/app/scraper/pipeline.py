@@ -1,26 +1,54 @@
 from __future__ import annotations
 
+import json
 import logging
 import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from urllib.parse import urlparse
 
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.events.bus import EventBus
 from app.events.models import ScrapeEvent
-from app.models.lead import Lead
+from app.jobs.cancellation import CancellationToken, JobCancelled
 from app.models.scrape_job import JobStatus, ScrapeJob
+from app.scraper.breaker import HostBreaker
+from app.scraper.context import CrawlContext, CrawlStats
+from app.scraper.crawl_policy import CrawlPolicy
+from app.scraper.dead_hosts import known_dead_hosts, remember_dead_hosts
+from app.scraper.dedup import dedupe_places
 from app.scraper.enrichment import enrich_apollo, enrich_email_hunter
+from app.scraper.freshness import apply_previous_scrape, recent_leads_by_domain
+from app.scraper.http_pool import HttpPool
+from app.scraper.persistence import LeadWriter
+from app.scraper.profiling import StageProfiler
+from app.scraper.page_cache import PageCache, cached_pages, remember_pages
+from app.scraper.robots import RobotsCache, cached_robots, remember_robots
 from app.scraper.scoring import score_lead
 from app.scraper.search import parse_place, search_google_places
-from app.scraper.website import scrape_website
+from app.scraper.stages import StagePipeline
+from app.scraper.throttle import HostThrottle
+from app.scraper.website import SiteCrawl, fetch_site
 
 log = logging.getLogger(__name__)
 
 
+@dataclass
+class _PlaceWork:
+    """One place moving through the stage pipeline."""
+
+    index: int
+    lead: dict
+    crawl: SiteCrawl | None = None
+
+
 class ScrapeOrchestrator:
-    """Full scrape pipeline: search -> scrape -> enrich -> score -> persist."""
+    """Full scrape pipeline: search -> fetch -> parse -> enrich -> score -> persist.
+
+    After the search, places flow through worker stages joined by bounded
+    queues (see ``StagePipeline``); the job's own thread is the single writer.
+    """
 
     def __init__(
         self,
@@ -28,150 +56,316 @@ class ScrapeOrchestrator:
         event_bus: EventBus,
         api_keys: dict,
         scoring_weights: dict = None,
+        cancel_token: CancellationToken | None = None,
     ):
         self.db = db
         self.event_bus = event_bus
         self.api_keys = api_keys
         self.scoring_weights = scoring_weights
+        self.cancel_token = cancel_token or CancellationToken()
+        self.profiler = StageProfiler()
+        self.http: HttpPool | None = None
+        self.crawl_stats = CrawlStats()
+        self.breaker = HostBreaker(settings.breaker_failures, settings.breaker_cooldown)
+        self.robots = RobotsCache()
+        self.pages = PageCache()
+        self._started = time.perf_counter()
+
+    def run(
+        self,
+        job_id: int,
+        category: str,
+        location: str,
+        num_results: int = 20,
+        delay: float = 1.5,
+        concurrency: int = 5,
+    ):
+        """Run a job. ``delay`` is the spacing between requests to the same host once
+        its burst (``settings.host_burst``) is used up; ``concurrency`` is the
+        number of places processed in parallel."""
+        job = self._start(job_id, category, location)
+        writer = LeadWriter(self.db, job, settings.persist_batch_size, self.profiler)
+        if self.cancel_token.cancelled:
+            self._cancel(job, writer)
+            return
+
+        try:
+            places = self._checkpointed_places(job, writer)
+            if places is None:
+                places = self._search(job, num_results)
+                self._checkpoint_places(job, places)
+                self._emit(job_id, "search_complete", {"count": len(places)})
 
-    def run(self, job_id: int, category: str, location: str, num_results: int = 20, delay: float = 1.5):
+            todo = [(i, lead) for i, lead in self._prepare_places(job, places) if i not in writer.done]
+            if not todo:
+                self._complete(job, writer)
+                return
+
+            # Stages run in their own worker threads; only this thread touches the DB
+            self.http = HttpPool(settings.http_pool_hosts, settings.http_pool_per_host)
+            ctx = CrawlContext(
+                throttle=HostThrottle(delay, settings.host_burst), cancel_token=self.cancel_token,
+                profiler=self.profiler, http=self.http, stats=self.crawl_stats,
+                policy=CrawlPolicy.parse(job.crawl_stop_when), breaker=self.breaker, robots=self.robots,
+                pages=self.pages,
+            )
+            stages = self._build_stages(job_id, ctx, concurrency, len(todo))
+            stages.start(_PlaceWork(i, lead) for i, lead in todo)
+            try:
+                for work in stages.results():
+                    writer.add(work.lead, work.index)
+                    self._emit_processed(
+                        job_id, len(writer.done), len(places), work.lead, stages.queue_depths(),
+                    )
+            finally:
+                stages.stop()
+                self.http.close()
+
+            self._complete(job, writer)
+
+        except JobCancelled:
+            self._cancel(job, writer)
+        except Exception as e:
+            self._fail(job, e, writer)
+
+    def _start(self, job_id: int, category: str, location: str) -> ScrapeJob:
         job = self.db.query(ScrapeJob).get(job_id)
+        if job.status == JobStatus.CANCELLED:
+            # Cancelled while still queued
+            self.cancel_token.cancel()
+        # Resumed jobs keep accumulating onto the earlier runs' profile
+        self.profiler = StageProfiler(job.profile)
+        self._started = time.perf_counter()
         job.status = JobStatus.RUNNING
+        job.error_message = None
+        job.completed_at = None
         self.db.commit()
         self._emit(job_id, "started", {"category": category, "location": location})
+        return job
 
-        try:
-            # Search
-            self._emit(job_id, "searching", {"category": category, "location": location})
-            places = search_google_places(
-                category, location, num_results,
+    def _save_profile(self, job: ScrapeJob):
+        self.profiler.add("total", seconds=time.perf_counter() - self._started, calls=1)
+        job.profile_json = json.dumps(self.profiler.snapshot())
+        counters = self.crawl_stats.snapshot()
+        if self.http is not None:
+            counters.update(self.http.stats.snapshot())
+        if counters:
+            # Crawl counters and connection reuse, summed over every run of a resumed job
+            previous = job.stats
+            job.update_stats(**{k: previous.get(k, 0) + v for k, v in counters.items()})
+
+    def _search(self, job: ScrapeJob, num_results: int) -> list:
+        """Run every search of the job; a batch geocodes each distinct location once."""
+        geocoded = {}
+        places = []
+        for n, query in enumerate(job.queries, start=1):
+            self.cancel_token.raise_if_cancelled()
+            self._emit(job.id, "searching", {**query, "query": n, "queries": len(job.queries)})
+            places += search_google_places(
+                query["category"], query["location"], num_results,
                 serper_key=self.api_keys.get("serper_key", ""),
                 serpapi_key=self.api_keys.get("serpapi_key", ""),
+                profiler=self.profiler,
+                geocoded=geocoded,
+                sleep=self.cancel_token.sleep,
             )
-            self._emit(job_id, "search_complete", {"count": len(places)})
-
-            if not places:
-                job.status = JobStatus.COMPLETED
-                job.lead_count = 0
-                job.completed_at = datetime.now(timezone.utc)
-                self.db.commit()
-                self._emit(job_id, "completed", {"lead_count": 0})
-                return
+        return places
+
+    def _checkpointed_places(self, job: ScrapeJob, writer: LeadWriter) -> list | None:
+        """Search results saved by an earlier run of this job, or None if it never got that far."""
+        if job.places_json is None:
+            return None
+        places = json.loads(job.places_json)
+        self._emit(job.id, "resumed", {"total": len(places), "done": len(writer.done)})
+        return places
+
+    def _checkpoint_places(self, job: ScrapeJob, places: list):
+        job.places_json = json.dumps(places)
+        self.db.commit()
+
+    def _prepare_places(self, job: ScrapeJob, places: list) -> list[tuple[int, dict]]:
+        """Normalize search results, merge duplicates and reuse recent scrapes before any fetching."""
+        unique, fetches_saved = dedupe_places([parse_place(p) for p in places])
+        self._emit(job.id, "dedup_complete", {
+            "total": len(places),
+            "unique": len(unique),
+            "duplicates_merged": len(places) - len(unique),
+            "fetches_saved": fetches_saved,
+        })
 
-            # Process each place
-            leads_data = []
-            for i, place in enumerate(places):
-                if self._is_cancelled(job_id):
-                    job.status = JobStatus.CANCELLED
-                    self.db.commit()
-                    self._emit(job_id, "cancelled", {})
-                    return
-
-                lead_data = parse_place(place)
-
-                # Scrape website
-                website_data = scrape_website(lead_data["website"])
-                lead_data.update(website_data)
-
-                # Enrichment
-                domain = ""
-                if lead_data["website"]:
-                    try:
-                        domain = urlparse(lead_data["website"]).netloc.replace("www.", "")
-                    except Exception:
-                        pass
-                lead_data["domain"] = domain
-
-                hunter_data = enrich_email_hunter(domain, self.api_keys.get("hunter_key", ""))
-                lead_data.update(hunter_data)
-
-                apollo_data = enrich_apollo(domain, self.api_keys.get("apollo_key", ""))
-                lead_data.update(apollo_data)
-
-                # Score
-                lead_data["score"] = score_lead(lead_data, self.scoring_weights)
-                leads_data.append(lead_data)
-
-                self._emit(job_id, "lead_processed", {
-                    "index": i + 1,
-                    "total": len(places),
-                    "business_name": lead_data["business_name"],
-                    "score": lead_data["score"],
-                    "scrape_status": lead_data.get("scrape_status", ""),
-                })
-                time.sleep(delay)
-
-            # Deduplicate
-            leads_data = self._deduplicate(leads_data)
-
-            # Persist to DB
-            for ld in leads_data:
-                lead = Lead(job_id=job_id, **self._to_model_fields(ld))
-                self.db.add(lead)
-
-            job.status = JobStatus.COMPLETED
-            job.lead_count = len(leads_data)
-            job.completed_at = datetime.now(timezone.utc)
-            self.db.commit()
-            self._emit(job_id, "completed", {"lead_count": len(leads_data)})
+        domains = [lead["domain"] for _, lead in unique if lead["domain"]]
+        previous = recent_leads_by_domain(self.db, job.user_id, domains, job.freshness_days or 0, job.id)
+        for _, lead in unique:
+            if lead["domain"] in previous:
+                apply_previous_scrape(lead, previous[lead["domain"]])
+        self._emit(job.id, "freshness_complete", {
+            "domains_reused": len(previous),
+            "domains_fetched": len(domains) - len(previous),
+        })
 
+        # Domains an earlier job found unreachable are refused by the breaker without a request
+        crawled = [d for d in domains if d not in previous]
+        dead = {}
+        if settings.dead_host_ttl_hours > 0:
+            dead = known_dead_hosts(self.db, crawled)
+            self.breaker.preload(dead)
+        robots = {}
+        if settings.respect_robots and settings.robots_ttl_hours > 0:
+            robots = cached_robots(self.db, [d for d in crawled if d not in dead])
+            self.robots.preload(robots)
+        pages = {}
+        if settings.page_cache_ttl_hours > 0:
+            # Pages from earlier crawls are re-fetched conditionally and not re-parsed if unchanged
+            pages = cached_pages(self.db, [d for d in crawled if d not in dead])
+            self.pages.preload(pages)
+
+        job.update_stats(
+            places_found=len(places),
+            duplicates_merged=len(places) - len(unique),
+            fetches_saved=fetches_saved,
+            domains_reused=len(previous),
+            domains_fetched=len(domains) - len(previous),
+            dead_hosts_skipped=len(dead),
+            robots_cached=len(robots),
+            pages_cached=sum(len(entries) for entries in pages.values()),
+        )
+        self.db.commit()
+        return unique
+
+    def _remember_hosts(self):
+        """Store what this job learned about hosts for later jobs: those whose
+        circuit ended the job open, the robots.txt files it fetched, and the
+        validators, hashes and signals of the pages it crawled.
+
+        Best effort, run after the job's status is committed: a failed cache
+        write (a key another job inserted first, a locked database) is logged
+        and never changes how the job ended.
+        """
+        writes = []
+        if settings.dead_host_ttl_hours > 0:
+            writes.append(("dead hosts", lambda: remember_dead_hosts(
+                self.db, self.breaker.dead_hosts(), settings.dead_host_ttl_hours,
+            )))
+        if settings.respect_robots and settings.robots_ttl_hours > 0:
+            writes.append(("robots.txt", lambda: remember_robots(
+                self.db, self.robots.fetched(), settings.robots_ttl_hours,
+            )))
+        if settings.page_cache_ttl_hours > 0:
+            writes.append(("pages", lambda: remember_pages(
+                self.db, self.pages.updated(), settings.page_cache_ttl_hours,
+            )))
+        for what, write in writes:
+            try:
+                write()
+            except Exception as e:
+                log.warning(f"Could not cache {what} for later jobs: {e}")
+                self.db.rollback()
+
+    def _abandoned(self, job: ScrapeJob) -> bool:
+        """True once another worker owns the job: this run must leave its leads and status alone."""
+        if not self.cancel_token.abandoned:
+            return False
+        self.db.rollback()
+        log.warning(f"Job {job.id} was taken over by another worker, stopping without saving")
+        return True
+
+    def _complete(self, job: ScrapeJob, writer: LeadWriter):
+        if self._abandoned(job):
+            return
+        writer.flush()
+        self._save_profile(job)
+        job.status = JobStatus.COMPLETED
+        job.lead_count = writer.written
+        job.completed_at = datetime.now(timezone.utc)
+        self.db.commit()
+        self._remember_hosts()
+        self._emit(job.id, "completed", {"lead_count": writer.written, "stats": job.stats})
+
+    def _cancel(self, job: ScrapeJob, writer: LeadWriter):
+        if self._abandoned(job):
+            return
+        # Keep whatever finished before the cancel
+        writer.flush()
+        self._save_profile(job)
+        job.status = JobStatus.CANCELLED
+        self.db.commit()
+        self._remember_hosts()
+        self._emit(job.id, "cancelled", {"lead_count": writer.written})
+
+    def _fail(self, job: ScrapeJob, error: Exception, writer: LeadWriter):
+        log.error(f"Pipeline error for job {job.id}: {error}", exc_info=error)
+        if self._abandoned(job):
+            return
+        self.db.rollback()
+        try:
+            writer.flush()
         except Exception as e:
-            log.error(f"Pipeline error for job {job_id}: {e}", exc_info=True)
-            job.status = JobStatus.FAILED
-            job.error_message = str(e)[:500]
-            self.db.commit()
-            self._emit(job_id, "failed", {"error": str(e)[:200]})
+            log.warning(f"Could not save buffered leads for failed job {job.id}: {e}")
+            self.db.rollback()
+        self._save_profile(job)
+        job.status = JobStatus.FAILED
+        job.error_message = str(error)[:500]
+        self.db.commit()
+        self._remember_hosts()
+        self._emit(job.id, "failed", {"error": str(error)[:200]})
+
+    def _build_stages(self, job_id: int, ctx: CrawlContext, concurrency: int, todo: int) -> StagePipeline:
+        enrich_workers = min(settings.enrich_workers, todo)
+        return (
+            StagePipeline(f"scrape-job-{job_id}", self.cancel_token, settings.stage_queue_size)
+            .add_stage("fetch", lambda work: self._fetch_stage(work, ctx), min(concurrency, todo))
+            .add_stage("parse", self._parse_stage, min(settings.parse_workers, todo))
+            .add_stage("enrich", lambda work: self._enrich_stage(work, ctx), enrich_workers)
+            .add_stage("score", self._score_stage, 1)
+        )
+
+    # Stage functions run in worker threads — no DB access.
+
+    def _fetch_stage(self, work: _PlaceWork, ctx: CrawlContext) -> _PlaceWork:
+        ctx.check_cancelled()
+        if not work.lead.get("reused"):
+            work.crawl = SiteCrawl(work.lead["website"], ctx.policy, ctx.pages)
+            fetch_site(work.crawl, ctx)
+        return work
+
+    def _parse_stage(self, work: _PlaceWork) -> _PlaceWork:
+        if work.crawl is not None:
+            with self.profiler.stage("parse"):
+                work.lead.update(work.crawl.finish())
+            work.crawl = None
+        return work
+
+    def _enrich_stage(self, work: _PlaceWork, ctx: CrawlContext) -> _PlaceWork:
+        # Provider calls are paced by the shared provider clients (see ``providers``);
+        # ctx.sleep makes their retry waits cancellable
+        lead_data = work.lead
+        domain = lead_data["domain"]
+        if lead_data.get("reused") or not domain:
+            return work
+
+        hunter_key = self.api_keys.get("hunter_key", "")
+        lead_data.update(enrich_email_hunter(domain, hunter_key, self.profiler, ctx.sleep))
+
+        apollo_key = self.api_keys.get("apollo_key", "")
+        lead_data.update(enrich_apollo(domain, apollo_key, self.profiler, ctx.sleep))
+        return work
+
+    def _score_stage(self, work: _PlaceWork) -> _PlaceWork:
+        with self.profiler.stage("score"):
+            work.lead["score"] = score_lead(work.lead, self.scoring_weights)
+        return work
 
     def _emit(self, job_id: int, event_type: str, data: dict):
         self.event_bus.publish(f"job:{job_id}", ScrapeEvent(type=event_type, data=data))
 
-    def _is_cancelled(self, job_id: int) -> bool:
-        self.db.expire_all()
-        job = self.db.query(ScrapeJob).get(job_id)
-        return job.status == JobStatus.CANCELLED
-
-    def _deduplicate(self, leads: list) -> list:
-        seen_domains = set()
-        seen_names = set()
-        unique = []
-        for lead in leads:
-            d = lead.get("domain", "")
-            n = lead.get("business_name", "")
-            if d and d in seen_domains:
-                continue
-            if not d and n in seen_names:
-                continue
-            if d:
-                seen_domains.add(d)
-            seen_names.add(n)
-            unique.append(lead)
-        return unique
+    def _emit_processed(self, job_id: int, index: int, total: int, lead_data: dict, queues: dict | None = None):
+        self._emit(job_id, "lead_processed", {
+            "index": index,
+            "total": total,
+            "business_name": lead_data["business_name"],
+            "score": lead_data["score"],
+            "scrape_status": lead_data.get("scrape_status", ""),
+            "reused": lead_data.get("reused", False),
+            "queues": queues or {},
+        })
 
-    def _to_model_fields(self, data: dict) -> dict:
-        return {
-            "business_name": data.get("business_name", ""),
-            "category": data.get("category", ""),
-            "address": data.get("address", ""),
-            "phone": data.get("phone", ""),
-            "website": data.get("website", ""),
-            "domain": data.get("domain", ""),
-            "rating": data.get("rating"),
-            "reviews": data.get("reviews"),
-            "google_maps_url": data.get("google_maps_url", ""),
-            "emails_found": data.get("emails_found", ""),
-            "tech_stack": data.get("tech_stack", ""),
-            "has_it_mention": data.get("has_it_mention", False),
-            "has_existing_msp": data.get("has_existing_msp", False),
-            "compliance_mention": data.get("compliance_mention", ""),
-            "ssl_valid": data.get("ssl_valid", False),
-            "scrape_status": data.get("scrape_status", ""),
-            "hunter_email": data.get("hunter_email", ""),
-            "hunter_name": data.get("hunter_name", ""),
-            "hunter_confidence": data.get("hunter_confidence"),
-            "apollo_email": data.get("apollo_email", ""),
-            "apollo_name": data.get("apollo_name", ""),
-            "apollo_title": data.get("apollo_title", ""),
-            "company_size": data.get("company_size", ""),
-            "industry": data.get("industry", ""),
-            "score": data.get("score", 0),
-        }
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Iterator
+
+from app.jobs.cancellation import JobCancelled
+
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0
+    calls: int = 0
+    bytes: int = 0
+    errors: int = 0
+
+
+class StageRecorder:
+    """Handle yielded by ``StageProfiler.stage`` for the call being timed."""
+
+    def __init__(self, profiler: StageProfiler, name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def add_bytes(self, n: int):
+        self._profiler.add(self._name, bytes=n)
+
+    def error(self):
+        """Count a failure that the caller handles instead of raising."""
+        self._profiler.add(self._name, errors=1)
+
+
+class StageProfiler:
+    """Thread-safe wall time, call, byte and error counters per pipeline stage.
+
+    Stage seconds are summed over calls, so with concurrent workers a stage can
+    add up to more than the job's own wall time; ``total`` is the job itself.
+    """
+
+    def __init__(self, snapshot: dict | None = None):
+        self._stages: dict[str, StageStats] = {
+            name: StageStats(**values) for name, values in (snapshot or {}).items()
+        }
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float = 0.0, calls: int = 0, bytes: int = 0, errors: int = 0):
+        with self._lock:
+            stats = self._stages.setdefault(name, StageStats())
+            stats.seconds += seconds
+            stats.calls += calls
+            stats.bytes += bytes
+            stats.errors += errors
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecorder]:
+        """Time one call of a stage; an exception escaping the block counts as an error."""
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield StageRecorder(self, name)
+        except JobCancelled:
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.add(name, seconds=time.perf_counter() - start, calls=1, errors=int(failed))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {**asdict(stats), "seconds": round(stats.seconds, 3)}
+                for name, stats in self._stages.items()
+            }
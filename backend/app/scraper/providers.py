@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import threading
+import time
+from typing import Callable
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+# Paid search and enrichment APIs that go through a ProviderClient
+PROVIDERS = ("serper", "serpapi", "hunter", "apollo")
+# Statuses retried after a backoff; 429 and 503 may carry a Retry-After
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Backoff before retry n when the provider gives no Retry-After: 1s, 2s, 4s, ...
+_BACKOFF_BASE = 1.0
+# Methods safe to resend after the request may have reached the provider;
+# anything else (the billable POSTs) is only resent if it never left
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def retry_after(headers, now: float | None = None) -> float | None:
+    """Seconds a Retry-After header asks to wait, from delta-seconds or an HTTP date."""
+    value = (headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+# httpx errors raised before the request was sent
+_HTTPX_NEVER_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _never_sent(error: requests.RequestException) -> bool:
+    """True if requests failed to connect, so the provider never saw the request."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ReadTimeout):
+        return False
+    reason = error.args[0] if error.args else None
+    return isinstance(reason, MaxRetryError) and isinstance(reason.reason, NewConnectionError)
+
+
+class AdaptiveLimit:
+    """Thread-safe AIMD limit on concurrent calls to one provider.
+
+    Each call that finishes cleanly raises the limit by ``1 / limit`` (about one
+    more slot per round of calls, up to ``max_limit``); a 429, a connection
+    error or a call slower than ``slow_seconds`` halves it, down to one. Only
+    calls started after the last decrease can trigger the next one, so a burst
+    of 429s answered to the same round of calls halves the limit once.
+    """
+
+    def __init__(self, max_limit: int = 4, slow_seconds: float = 5.0):
+        self.max_limit = max(1, max_limit)
+        self.slow_seconds = slow_seconds
+        self._limit = float(self.max_limit)
+        self._in_flight = 0
+        self._decreased_at = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self._in_flight >= int(self._limit):
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def free(self):
+        """Free a slot without adjusting the limit, for calls that say nothing about the provider."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def release(self, started: float, latency: float, congested: bool = False):
+        """Free a slot for a call started at ``started`` (monotonic) that took ``latency`` seconds."""
+        with self._cond:
+            self._in_flight -= 1
+            if congested or latency > self.slow_seconds:
+                if started >= self._decreased_at:
+                    self._limit = max(1.0, self._limit / 2)
+                    self._decreased_at = time.monotonic()
+            else:
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+
+class ProviderStats:
+    """Thread-safe call, latency and error counters for one provider."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+        self.retries = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, error: bool = False, throttled: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.errors += error
+            self.throttled += throttled
+            self.seconds += latency
+            self.max_seconds = max(self.max_seconds, latency)
+
+    def retried(self):
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "avg_seconds": round(self.seconds / self.calls, 3) if self.calls else 0.0,
+                "max_seconds": round(self.max_seconds, 3),
+            }
+
+
+class ProviderClient:
+    """Rate-limit-aware HTTP client for one API provider, shared by every job in the process.
+
+    Sync calls go through a keep-alive session of the provider's own; async
+    calls use the caller's ``httpx.AsyncClient`` but share the same limit and
+    counters. Concurrency adapts per ``AdaptiveLimit``. 429s and transient 5xx
+    or connection errors are retried up to ``max_retries`` times (for POSTs only
+    when the request never reached the provider, so it is not billed twice), waiting as
+    long as Retry-After asks or with exponential backoff; a Retry-After longer
+    than ``max_wait`` (e.g. a spent monthly quota) is returned at once instead.
+
+    Responses are returned as they are: callers still ``raise_for_status``.
+    """
+
+    def __init__(
+        self, name: str, max_concurrency: int = 4, slow_seconds: float = 5.0,
+        max_retries: int = 2, max_wait: float = 30.0,
+    ):
+        self.name = name
+        self.max_retries = max(0, max_retries)
+        self.max_wait = max_wait
+        self.limit = AdaptiveLimit(max_concurrency, slow_seconds)
+        self.stats = ProviderStats()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.limit.max_limit)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _wait(self, attempt: int, status: int | None, headers) -> float | None:
+        """Seconds to wait before retrying, or None to give up with this response."""
+        if attempt >= self.max_retries:
+            return None
+        delay = retry_after(headers) if headers is not None else None
+        if delay is None:
+            delay = _BACKOFF_BASE * 2 ** attempt
+        if delay > self.max_wait:
+            log.warning(f"{self.name}: asked to wait {delay:.0f}s (status {status}), not retrying")
+            return None
+        self.stats.retried()
+        return delay
+
+    def _finish(self, started: float, status: int | None):
+        """Release the call's slot and count it; ``status`` None means no response."""
+        latency = time.monotonic() - started
+        self.limit.release(started, latency, congested=status in (None, 429))
+        self.stats.record(latency, error=status is None or status >= 400, throttled=status == 429)
+
+    def _abort(self, started: float, error: BaseException):
+        """Release the slot of a call cut short by a cancel (or a bad request) without a
+        congestion signal; only real errors are counted."""
+        self.limit.free()
+        if isinstance(error, Exception):
+            self.stats.record(time.monotonic() - started, error=True)
+
+    def request(
+        self, method: str, url: str, sleep: Callable[[float], None] | None = None, **kwargs,
+    ) -> requests.Response:
+        """``session.request`` with the provider's limit and retries; ``sleep`` waits between
+        attempts (e.g. a cancellable job sleep)."""
+        sleep = sleep or time.sleep
+        attempt = 0
+        while True:
+            self.limit.acquire()
+            started = time.monotonic()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._finish(started, None)
+                resendable = method.upper() in _IDEMPOTENT_METHODS or _never_sent(e)
+                delay = self._wait(attempt, None, None) if resendable else None
+                if delay is None:
+                    raise
+            except BaseException as e:
+                self._abort(started, e)
+                raise
+            else:
+                self._finish(started, resp.status_code)
+                if resp.status_code not in _RETRY_STATUSES:
+                    return resp
+                delay = self._wait(attempt, resp.status_code, resp.headers)
+                if delay is None:
+                    return resp
+                resp.close()
+            sleep(delay)
+            attempt += 1
+
+    async def request_async(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """Async twin of ``request`` over the caller's client."""
+        attempt = 0
+        while True:
+            # The limit is shared with worker threads, so poll it rather than block the loop
+            while not self.limit.try_acquire():
+                await asyncio.sleep(0.05)
+            started = time.monotonic()
+            try:
+                resp = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                self._finish(started, None)
+                resendable = method.upper() in _IDEMPOTENT_METHODS or isinstance(e, _HTTPX_NEVER_SENT)
+                delay = self._wait(attempt, None, None) if resendable else None
+                if delay is None:
+                    raise
+            except BaseException as e:
+                # Includes task cancellation when the job is cancelled
+                self._abort(started, e)
+                raise
+            else:
+                self._finish(started, resp.status_code)
+                if resp.status_code not in _RETRY_STATUSES:
+                    return resp
+                delay = self._wait(attempt, resp.status_code, resp.headers)
+                if delay is None:
+                    return resp
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def snapshot(self) -> dict:
+        return {**self.stats.snapshot(), "concurrency": self.limit.limit}
+
+    def close(self):
+        self.session.close()
+
+
+_clients: dict[str, ProviderClient] = {}
+_lock = threading.Lock()
+
+
+def get_provider(name: str) -> ProviderClient:
+    """The process-wide client for a provider, created on first use."""
+    with _lock:
+        client = _clients.get(name)
+        if client is None:
+            client = _clients[name] = ProviderClient(
+                name,
+                max_concurrency=settings.provider_max_concurrency,
+                slow_seconds=settings.provider_slow_seconds,
+                max_retries=settings.provider_max_retries,
+                max_wait=settings.provider_max_wait,
+            )
+        return client
+
+
+def provider_stats() -> dict[str, dict]:
+    """Counters and current concurrency limit of every provider used since startup."""
+    with _lock:
+        clients = dict(_clients)
+    return {name: client.snapshot() for name, client in clients.items()}
+
+
+def close_providers():
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
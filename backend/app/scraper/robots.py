@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from sqlalchemy.orm import Session
+
+from app.scraper.dedup import normalize_domain
+from app.services.cache_service import CacheService
+
+# Token matched against robots.txt User-agent lines (besides "*")
+ROBOTS_AGENT = "MSPLeadScraper"
+# robots.txt bodies beyond this are ignored
+ROBOTS_MAX_BYTES = 512 * 1024
+# Cross-job cache of robots.txt responses, keyed by domain
+ROBOTS_CACHE = "robots"
+
+
+def robots_url(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/robots.txt"
+
+
+def parse_robots(status: int | None, text: str) -> RobotFileParser:
+    """Rules for a robots.txt response, following ``RobotFileParser.read``:
+    401/403 forbid everything, other failures (or no response) allow everything."""
+    rules = RobotFileParser()
+    if status in (401, 403):
+        rules.disallow_all = True
+    elif status is None or status >= 400:
+        rules.allow_all = True
+    else:
+        rules.parse(text.splitlines())
+    return rules
+
+
+class RobotsCache:
+    """Parsed robots.txt per domain for one job, shared by its fetch workers.
+
+    ``preload`` seeds it from the cross-job cache. Responses fetched during the
+    job are kept for ``fetched`` so the job can store them; when robots.txt
+    could not be fetched at all the site is allowed for this job only.
+    """
+
+    def __init__(self):
+        self._rules: dict[str, RobotFileParser] = {}
+        self._fetched: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def preload(self, responses: dict[str, dict]):
+        """domain -> {"status": ..., "text": ...} as stored by ``remember_robots``."""
+        parsed = {domain: parse_robots(r["status"], r["text"]) for domain, r in responses.items()}
+        with self._lock:
+            self._rules.update(parsed)
+
+    def get(self, url: str) -> RobotFileParser | None:
+        with self._lock:
+            return self._rules.get(normalize_domain(url))
+
+    def put(self, url: str, status: int | None, text: str) -> RobotFileParser:
+        domain = normalize_domain(url)
+        rules = parse_robots(status, text)
+        with self._lock:
+            self._rules[domain] = rules
+            if status is not None and status < 500:
+                self._fetched[domain] = {"status": status, "text": text}
+        return rules
+
+    def fetched(self) -> dict[str, dict]:
+        with self._lock:
+            return dict(self._fetched)
+
+
+def _key(domain: str) -> str:
+    return f"{ROBOTS_CACHE}:{domain}"
+
+
+def cached_robots(db: Session, domains: list[str]) -> dict[str, dict]:
+    """Unexpired robots.txt responses stored by earlier jobs, by domain."""
+    cached = CacheService(db).get_many([_key(d) for d in domains])
+    return {d: cached[_key(d)] for d in domains if _key(d) in cached}
+
+
+def remember_robots(db: Session, responses: dict[str, dict], ttl_hours: float):
+    CacheService(db).set_many({_key(d): r for d, r in responses.items()}, ROBOTS_CACHE, ttl_hours)
@@ -1,91 +1,135 @@
 from __future__ import annotations
 
 import logging
-import time
+from typing import Callable
 
 import requests
 
-from app.scraper.constants import HEADERS
+from app.jobs.cancellation import JobCancelled
+from app.scraper.constants import GEOCODE_HEADERS
+from app.scraper.profiling import StageProfiler
+from app.scraper.providers import get_provider
 
 log = logging.getLogger(__name__)
 
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+SERPER_MAPS_URL = "https://google.serper.dev/maps"
+SERPAPI_URL = "https://serpapi.com/search"
 
-def _geocode_location(location: str) -> str:
-    """Convert city/state to '@lat,lon,14z' for Serper. Returns empty string on failure."""
-    try:
-        params = {"q": location, "format": "json", "limit": 1}
-        headers = {"User-Agent": "MSPLeadScraper/2.0"}
-        resp = requests.get(
-            "https://nominatim.openstreetmap.org/search",
-            params=params, headers=headers, timeout=10,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        if data:
-            return f"@{data[0]['lat']},{data[0]['lon']},14z"
-    except Exception as e:
-        log.warning(f"Geocoding failed for '{location}': {e}")
-    return ""
-
-
-def _search_serper(query: str, location: str, num_results: int, serper_key: str) -> list:
-    """Search Google Maps via Serper.dev (2,500 free/month)."""
-    coords = _geocode_location(location)
-    results = []
-    page = 1
 
-    while len(results) < num_results:
-        payload = {"q": f"{query} in {location}"}
-        if coords:
-            payload["ll"] = coords
-        if page > 1:
-            payload["page"] = page
+def _geocode_params(location: str) -> dict:
+    return {"q": location, "format": "json", "limit": 1}
+
+
+def _coords_from_geocode(data: list) -> str:
+    return f"@{data[0]['lat']},{data[0]['lon']},14z" if data else ""
+
+
+def _serper_payload(query: str, location: str, coords: str, page: int) -> dict:
+    payload = {"q": f"{query} in {location}"}
+    if coords:
+        payload["ll"] = coords
+    if page > 1:
+        payload["page"] = page
+    return payload
 
+
+def _serpapi_params(query: str, location: str, serpapi_key: str, start: int) -> dict:
+    return {
+        "engine": "google_maps",
+        "q": f"{query} in {location}",
+        "type": "search",
+        "api_key": serpapi_key,
+        "start": start,
+    }
+
+
+def _geocode_location(location: str, profiler: StageProfiler, geocoded: dict | None = None) -> str:
+    """Convert city/state to '@lat,lon,14z' for Serper. Returns empty string on failure.
+
+    ``geocoded`` caches results by location across the searches of a batch job.
+    """
+    if geocoded is not None and location in geocoded:
+        return geocoded[location]
+    coords = ""
+    with profiler.stage("geocode") as stage:
         try:
-            resp = requests.post(
-                "https://google.serper.dev/maps",
-                headers={"X-API-KEY": serper_key, "Content-Type": "application/json"},
-                json=payload, timeout=15,
+            resp = requests.get(
+                NOMINATIM_URL, params=_geocode_params(location), headers=GEOCODE_HEADERS, timeout=10,
             )
+            stage.add_bytes(len(resp.content))
             resp.raise_for_status()
-            places = resp.json().get("places", [])
-            if not places:
-                break
-            results.extend(places)
-            page += 1
-            time.sleep(0.5)
+            coords = _coords_from_geocode(resp.json())
         except Exception as e:
-            log.error(f"Serper error: {e}")
+            stage.error()
+            log.warning(f"Geocoding failed for '{location}': {e}")
+    if geocoded is not None:
+        geocoded[location] = coords
+    return coords
+
+
+def _search_serper(
+    query: str, location: str, num_results: int, serper_key: str, profiler: StageProfiler,
+    geocoded: dict | None = None, sleep: Callable[[float], None] | None = None,
+) -> list:
+    """Search Google Maps via Serper.dev (2,500 free/month)."""
+    coords = _geocode_location(location, profiler, geocoded)
+    results = []
+    page = 1
+
+    while len(results) < num_results:
+        payload = _serper_payload(query, location, coords, page)
+
+        with profiler.stage("search") as stage:
+            try:
+                resp = get_provider("serper").request(
+                    "POST", SERPER_MAPS_URL, sleep=sleep,
+                    headers={"X-API-KEY": serper_key, "Content-Type": "application/json"},
+                    json=payload, timeout=15,
+                )
+                stage.add_bytes(len(resp.content))
+                resp.raise_for_status()
+                places = resp.json().get("places", [])
+            except JobCancelled:
+                raise
+            except Exception as e:
+                stage.error()
+                log.error(f"Serper error: {e}")
+                break
+        if not places:
             break
+        results.extend(places)
+        page += 1
 
     return results[:num_results]
 
 
-def _search_serpapi(query: str, location: str, num_results: int, serpapi_key: str) -> list:
+def _search_serpapi(
+    query: str, location: str, num_results: int, serpapi_key: str, profiler: StageProfiler,
+    sleep: Callable[[float], None] | None = None,
+) -> list:
     """Search Google Maps via SerpAPI (100 free/month)."""
     results = []
     start = 0
 
     while len(results) < num_results:
-        params = {
-            "engine": "google_maps",
-            "q": f"{query} in {location}",
-            "type": "search",
-            "api_key": serpapi_key,
-            "start": start,
-        }
-        try:
-            resp = requests.get("https://serpapi.com/search", params=params, timeout=15)
-            resp.raise_for_status()
-            places = resp.json().get("local_results", [])
-            if not places:
+        params = _serpapi_params(query, location, serpapi_key, start)
+        with profiler.stage("search") as stage:
+            try:
+                resp = get_provider("serpapi").request("GET", SERPAPI_URL, sleep=sleep, params=params, timeout=15)
+                stage.add_bytes(len(resp.content))
+                resp.raise_for_status()
+                places = resp.json().get("local_results", [])
+            except JobCancelled:
+                raise
+            except Exception as e:
+                stage.error()
+                log.error(f"SerpAPI error: {e}")
                 break
-            results.extend(places)
-            start += len(places)
-            time.sleep(1)
-        except Exception as e:
-            log.error(f"SerpAPI error: {e}")
+        if not places:
             break
+        results.extend(places)
+        start += len(places)
 
     return results[:num_results]
 
@@ -96,16 +140,25 @@ def search_google_places(
     num_results: int = 20,
     serper_key: str = "",
     serpapi_key: str = "",
+    profiler: StageProfiler | None = None,
+    geocoded: dict | None = None,
+    sleep: Callable[[float], None] | None = None,
 ) -> list:
-    """Auto-detect which API to use: Serper > SerpAPI > mock."""
+    """Auto-detect which API to use: Serper > SerpAPI > mock.
+
+    Calls go through the shared provider clients (see ``providers``), which pace
+    pages by the provider's 429s instead of fixed pauses; ``sleep`` is how they
+    wait before a retry.
+    """
     from app.scraper.mock import mock_places
 
+    profiler = profiler or StageProfiler()
     if serper_key:
         log.info("Using Serper.dev for Google Maps search")
-        return _search_serper(query, location, num_results, serper_key)
+        return _search_serper(query, location, num_results, serper_key, profiler, geocoded, sleep)
     elif serpapi_key:
         log.info("Using SerpAPI for Google Maps search")
-        return _search_serpapi(query, location, num_results, serpapi_key)
+        return _search_serpapi(query, location, num_results, serpapi_key, profiler, sleep)
     else:
         log.warning("No API key set. Using mock data.")
         return mock_places(query, location)
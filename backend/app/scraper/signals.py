@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from app.scraper.constants import COMPLIANCE_KEYWORDS, IT_KEYWORDS, TECH_SIGNALS
+
+# Below this many patterns one ``in`` test per pattern is faster than the
+# compiled scan; benchmarks/signals.py puts the crossover at 100-150 patterns
+COMPILE_THRESHOLD = 128
+
+
+def _trie_regex(patterns: Iterable[str]) -> str:
+    """Alternation of literal patterns factored by common prefix, longest match first.
+
+    At any text position the regex engine then follows one branch per
+    character instead of trying every pattern, so scan cost grows with
+    pattern length rather than pattern count.
+    """
+    trie: dict = {}
+    for pattern in patterns:
+        node = trie
+        for ch in pattern:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class SignalMatcher:
+    """Reports which of a fixed set of substrings occur in a text, in one pass.
+
+    Equivalent to ``{p for p in patterns if p in text}``. Each search finds
+    the longest pattern at the next position where any pattern starts, and the
+    next search resumes one character later, so overlapping matches are not
+    lost. Shorter patterns that are substrings of a match are implied rather
+    than searched for separately.
+
+    Tables smaller than ``compile_threshold`` are scanned one pattern at a
+    time instead, which is cheaper at that size.
+    """
+
+    def __init__(self, patterns: Iterable[str], compile_threshold: int = COMPILE_THRESHOLD):
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        self._regex = None
+        self._implied = {}
+        if self.patterns and len(self.patterns) >= compile_threshold:
+            self._regex = re.compile(_trie_regex(self.patterns))
+            self._implied = {p: frozenset(q for q in self.patterns if q in p) for p in self.patterns}
+
+    def find(self, text: str) -> set[str]:
+        if self._regex is None:
+            return {p for p in self.patterns if p in text}
+        matched = set()
+        search = self._regex.search
+        match = search(text)
+        while match is not None:
+            matched.add(match.group())
+            match = search(text, match.start() + 1)
+        found = set()
+        for pattern in matched:
+            found |= self._implied[pattern]
+        return found
+
+
+# Compiled once at import from the signal tables in constants.py
+TECH_MATCHER = SignalMatcher(p for patterns in TECH_SIGNALS.values() for p in patterns)
+KEYWORD_MATCHER = SignalMatcher(IT_KEYWORDS + COMPLIANCE_KEYWORDS)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+from app.jobs.cancellation import CancellationToken, JobCancelled
+
+log = logging.getLogger(__name__)
+
+# How often blocked queue operations re-check for cancellation or a failed stage
+_POLL_SECONDS = 0.1
+
+
+class _EndOfStream:
+    pass
+
+
+_END = _EndOfStream()
+
+
+@dataclass
+class _Stage:
+    name: str
+    func: Callable[[Any], Any]
+    workers: int
+    inbox: queue.Queue
+    alive: int = 0
+
+
+class StagePipeline:
+    """Worker stages joined by bounded queues.
+
+    Items fed in flow through each stage's ``func`` in order; a stage's output
+    is the next stage's input and ``func`` may return None to drop an item.
+    Full queues block the stage upstream, so backpressure reaches the feeder.
+    The caller's thread drains the last queue through ``results()``, which
+    re-raises the first stage error and raises JobCancelled on cancel.
+    """
+
+    def __init__(self, name: str, cancel_token: CancellationToken, queue_size: int = 50):
+        self.name = name
+        self.cancel_token = cancel_token
+        self.queue_size = max(1, queue_size)
+        self._stages: list[_Stage] = []
+        self._output: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._error: BaseException | None = None
+
+    def add_stage(self, name: str, func: Callable[[Any], Any], workers: int = 1) -> StagePipeline:
+        inbox = queue.Queue(maxsize=self.queue_size)
+        self._stages.append(_Stage(name, func, max(1, workers), inbox))
+        return self
+
+    def queue_depths(self) -> dict[str, int]:
+        depths = {stage.name: stage.inbox.qsize() for stage in self._stages}
+        depths["persist"] = self._output.qsize()
+        return depths
+
+    def start(self, items: Iterable[Any]):
+        for position, stage in enumerate(self._stages):
+            stage.alive = stage.workers
+            for n in range(stage.workers):
+                threading.Thread(
+                    target=self._work, args=(position,), daemon=True, name=f"{self.name}-{stage.name}-{n}",
+                ).start()
+        threading.Thread(target=self._feed, args=(items,), daemon=True, name=f"{self.name}-feed").start()
+
+    def results(self) -> Iterator[Any]:
+        while True:
+            item = self._get(self._output)
+            if item is _END:
+                return
+            yield item
+
+    def stop(self):
+        """Make every worker exit at its next queue operation."""
+        self._stopped.set()
+
+    def _halted(self) -> bool:
+        return self._stopped.is_set() or self.cancel_token.cancelled
+
+    def _put(self, q: queue.Queue, item: Any):
+        while True:
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                if self._halted():
+                    raise JobCancelled()
+
+    def _get(self, q: queue.Queue) -> Any:
+        while True:
+            if self._error is not None:
+                raise self._error
+            if self._halted():
+                raise JobCancelled()
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def _feed(self, items: Iterable[Any]):
+        first = self._stages[0] if self._stages else None
+        target = first.inbox if first else self._output
+        try:
+            for item in items:
+                self._put(target, item)
+            for _ in range(first.workers if first else 1):
+                self._put(target, _END)
+        except JobCancelled:
+            pass
+
+    def _work(self, position: int):
+        stage = self._stages[position]
+        downstream = self._stages[position + 1] if position + 1 < len(self._stages) else None
+        target = downstream.inbox if downstream else self._output
+        try:
+            while True:
+                item = self._get(stage.inbox)
+                if item is _END:
+                    break
+                result = stage.func(item)
+                if result is not None:
+                    self._put(target, result)
+        except JobCancelled:
+            return
+        except Exception as e:
+            log.error(f"{self.name}: stage {stage.name} failed: {e}", exc_info=e)
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+            self.stop()
+            return
+
+        # The last worker out of a stage closes the stream for the next one
+        with self._lock:
+            stage.alive -= 1
+            last = stage.alive == 0
+        if last:
+            try:
+                for _ in range(downstream.workers if downstream else 1):
+                    self._put(target, _END)
+            except JobCancelled:
+                pass
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+def host_of(url: str) -> str:
+    """Lowercased host of a URL with any leading 'www.' removed."""
+    try:
+        host = urlparse(url).netloc.lower()
+    except ValueError:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+class HostThrottle:
+    """Thread-safe per-host token bucket.
+
+    Each host gets a bucket refilled at one request per ``min_interval``
+    seconds and holding up to ``burst`` requests, so a site sees at most
+    ``burst`` requests back to back and ``1 / min_interval`` per second after
+    that. Buckets are independent: requests to unrelated hosts never wait on
+    each other. ``set_interval`` slows a single host down, e.g. to honour its
+    robots.txt Crawl-delay.
+
+    ``reserve`` takes the next token and returns how long to wait for it, so
+    callers can sleep in whatever way suits them (cancellable, async).
+    """
+
+    def __init__(self, min_interval: float = 1.5, burst: int = 1):
+        self.min_interval = max(0.0, min_interval)
+        self.burst = max(1, burst)
+        # Per host: when the bucket will next be full again ("theoretical
+        # arrival time"); each request pushes it one interval further
+        self._full_at: dict[str, float] = {}
+        self._intervals: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def set_interval(self, url: str, seconds: float):
+        """Space requests to the URL's host at least ``seconds`` apart, without a burst."""
+        with self._lock:
+            self._intervals[host_of(url)] = max(0.0, seconds)
+
+    def reserve(self, url: str) -> float:
+        """Take a token from the URL's host bucket; returns seconds to wait for it."""
+        host = host_of(url)
+        with self._lock:
+            interval = self._intervals.get(host)
+            burst = 1 if interval is not None else self.burst
+            if interval is None:
+                interval = self.min_interval
+            if interval <= 0:
+                return 0.0
+            now = time.monotonic()
+            full_at = max(now, self._full_at.get(host, now))
+            start = max(now, full_at - (burst - 1) * interval)
+            self._full_at[host] = full_at + interval
+        return start - now
+
+    def wait(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
@@ -1,177 +1,582 @@
 from __future__ import annotations
 
-import json
 import logging
-import re
+import socket
 import time
+from concurrent.futures.process import BrokenProcessPool
 
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from urllib.parse import urldefrag, urljoin, urlsplit
 
+from app.config import settings
 from app.scraper.constants import (
     COMPLIANCE_KEYWORDS,
     EXTRA_PATHS,
     HEADERS,
-    IT_KEYWORDS,
+    MAX_SUBPAGES,
     MSP_TOOL_SIGNALS,
+    SUBPAGE_KEYWORDS,
     TECH_SIGNALS,
 )
+from app.jobs.cancellation import JobCancelled
+from app.scraper.context import CrawlContext
+from app.scraper.crawl_policy import CrawlPolicy
+from app.scraper.extraction import extract_page
+from app.scraper.page_cache import PageCache, conditional_headers, content_hash, response_validators
+from app.scraper.parse_pool import discard_parse_pool, get_parse_pool
+from app.scraper.robots import ROBOTS_AGENT, ROBOTS_MAX_BYTES, robots_url
 
 log = logging.getLogger(__name__)
 
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+_CHUNK_SIZE = 64 * 1024
+# Attempts per page in fetch_page; the backoff between them doubles from 2s
+_PAGE_RETRIES = 2
 
-def _request_with_retry(url: str, max_retries: int = 3, timeout: int = 10) -> requests.Response:
-    """GET with exponential backoff on 429/5xx."""
+
+class NotHtml(Exception):
+    """The response declared a content type other than HTML, so its body was never read."""
+
+
+class RobotsDisallowed(Exception):
+    """The site's robots.txt forbids fetching the page."""
+
+
+class HostUnreachable(Exception):
+    """The site's host did not resolve or refused the probe connection.
+
+    ``reason`` ("dns_error" or "connect_error") becomes the lead's scrape_status.
+    """
+
+    def __init__(self, reason: str, detail: str = ""):
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+
+
+def probe_address(url: str) -> tuple[str, int]:
+    parts = urlsplit(url)
+    return parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80)
+
+
+def probe_host(url: str, timeout: float):
+    """Resolve the site's host and open (then close) one TCP connection to it.
+
+    Raises HostUnreachable, so a dead site costs one attempt instead of every
+    page's retries and backoff sleeps.
+    """
+    host, port = probe_address(url)
+    try:
+        socket.create_connection((host, port), timeout=timeout).close()
+    except socket.gaierror as e:
+        raise HostUnreachable("dns_error", str(e)) from e
+    except OSError as e:
+        raise HostUnreachable("connect_error", str(e)) from e
+
+
+def dead_site_cost(probe_seconds: float) -> float:
+    """Estimated seconds crawling an unreachable site took before the probe:
+    every page tried ``_PAGE_RETRIES`` times, failing as slowly as the probe
+    did, with the backoff sleeps in between."""
+    pages = 1 + len(EXTRA_PATHS)
+    backoff = sum(2 ** (attempt + 1) for attempt in range(_PAGE_RETRIES - 1))
+    return pages * (_PAGE_RETRIES * probe_seconds + backoff)
+
+
+def is_html(content_type: str | None) -> bool:
+    """Servers that send no Content-Type get the benefit of the doubt."""
+    if not content_type:
+        return True
+    return content_type.split(";")[0].strip().lower() in _HTML_TYPES
+
+
+def read_capped(chunks, max_bytes: int) -> tuple[bytes, bool]:
+    """Join body chunks until ``max_bytes`` (0 = no cap); returns (body, truncated)."""
+    body = bytearray()
+    for chunk in chunks:
+        body += chunk
+        if max_bytes and len(body) > max_bytes:
+            return bytes(body[:max_bytes]), True
+    return bytes(body), False
+
+
+def _request_with_retry(
+    url: str, max_retries: int = 3, timeout: int = 10, ctx: CrawlContext | None = None,
+    stream: bool = False, headers: dict | None = None,
+) -> requests.Response:
+    """GET with exponential backoff on 429/5xx. Backoff sleeps abort when ``ctx``'s job is cancelled.
+
+    With ``stream`` the body is left unread; the caller must close the response.
+    ``headers`` are sent on top of the scraper's own.
+    """
+    sleep = ctx.sleep if ctx is not None else time.sleep
+    http = ctx.http if ctx is not None else None
     resp = None
     for attempt in range(max_retries):
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=timeout, allow_redirects=True)
+            if http is not None:
+                resp = http.get(url, headers=headers, timeout=timeout, allow_redirects=True, stream=stream)
+            else:
+                resp = requests.get(
+                    url, headers={**HEADERS, **(headers or {})}, timeout=timeout, allow_redirects=True,
+                    stream=stream,
+                )
             if resp.status_code in (429, 500, 502, 503, 504) and attempt < max_retries - 1:
                 wait = 2 ** (attempt + 1)
                 log.warning(f"Got {resp.status_code} for {url}, retrying in {wait}s...")
-                time.sleep(wait)
+                resp.close()
+                sleep(wait)
                 continue
+            if resp.status_code >= 400:
+                resp.close()
             resp.raise_for_status()
             return resp
         except requests.exceptions.ConnectionError:
             if attempt < max_retries - 1:
-                time.sleep(2 ** (attempt + 1))
+                sleep(2 ** (attempt + 1))
             else:
                 raise
     return resp
 
 
-def _extract_emails_from_soup(soup: BeautifulSoup, raw_html: str = "") -> set:
-    """Extract emails from visible text, mailto links, JSON-LD, meta tags, and de-obfuscation."""
-    # Remove script/style so their content isn't matched
-    for tag in soup.find_all(["script", "style", "noscript"]):
-        if tag.get("type") != "application/ld+json":
-            tag.decompose()
-
-    emails = set()
+def _extract_pages(pages: list[tuple[bytes, str | None]]) -> list:
+    """Run ``extract_page`` over pages in the parse pool if there is one, else inline.
 
-    # 1. Visible text
-    visible_text = soup.get_text(separator=" ", strip=True)
-    emails.update(re.findall(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", visible_text))
-
-    # 2. Mailto links
-    for a_tag in soup.find_all("a", href=True):
-        href = a_tag["href"]
-        if href.startswith("mailto:"):
-            email = href.replace("mailto:", "").split("?")[0].strip()
-            if "@" in email:
-                emails.add(email)
+    Each entry is the page's signals or the exception parsing it raised.
+    """
+    pool = get_parse_pool()
+    if pool is not None:
+        try:
+            futures = [pool.submit(extract_page, content, encoding) for content, encoding in pages]
+            results = [f.exception() or f.result() for f in futures]
+        except BrokenProcessPool as e:
+            results = [e]
+        broken = next((r for r in results if isinstance(r, BrokenProcessPool)), None)
+        if broken is None:
+            return results
+        log.warning(f"Parse pool broke ({broken}), parsing in-process")
+        discard_parse_pool(pool)
+
+    results = []
+    for content, encoding in pages:
+        try:
+            results.append(extract_page(content, encoding))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _site_host(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _subpage_rank(url: str) -> int:
+    path = url.lower()
+    return next((i for i, keyword in enumerate(SUBPAGE_KEYWORDS) if keyword in path), len(SUBPAGE_KEYWORDS))
+
+
+class SiteCrawl:
+    """Crawl state for one website, independent of how pages are fetched.
+
+    Both ``scrape_website`` and the async engine drive the same object: ask for
+    ``next_url()``, fetch it, then report ``add_page()`` or ``add_error()``.
+    Fetched pages are only buffered; ``parse()`` and ``finish()`` do the CPU
+    work, so a pipeline can fetch and parse in different workers.
+
+    Subpages come from the homepage's contact and about links, falling back to
+    ``EXTRA_PATHS`` when it has none, and the remaining subpages are dropped
+    once ``policy`` is satisfied. Both need parsed pages (see ``needs_parse``).
+
+    Parsed pages are recorded in ``pages``. A page found there again, because
+    the server answered the conditional request 304 or sent the same bytes,
+    reuses its earlier signals and is never parsed.
+    """
+
+    def __init__(self, url: str, policy: CrawlPolicy | None = None, pages: PageCache | None = None):
+        self.url = url
+        self.policy = policy or CrawlPolicy()
+        self.pages = pages
+        self.result = {
+            "emails_found": "",
+            "tech_stack": "",
+            "has_it_mention": False,
+            "has_existing_msp": False,
+            "compliance_mention": "",
+            "ssl_valid": False,
+            "scrape_status": "ok",
+            "pages_fetched": 0,
+        }
+        self._emails = set()
+        self._tech = set()
+        self._compliance = set()
+        self._it_mention = False
+        self._truncated = False
+        # (url, body, encoding, cache entry without the signals)
+        self._raw_pages: list[tuple[str, bytes, str | None, dict]] = []
+        # Probes of EXTRA_PATHS avoided because the homepage linked its subpages
+        self.requests_saved = 0
+        self.pages_fetched = 0
+        # Subpages left unfetched because the policy was already satisfied
+        self.pages_skipped = 0
+        # Pages whose earlier signals were reused: answered 304, or same content hash
+        self.pages_not_modified = 0
+        self.pages_unchanged = 0
+
+        if not url:
+            self.result["scrape_status"] = "no_website"
+            self._pending = []
+            self._planned = True
+        else:
+            self._pending = [url]
+            self._planned = False
+
+    @property
+    def needs_parse(self) -> bool:
+        """Buffered pages decide what is fetched next: the homepage's links pick
+        the subpages, and a stop policy needs every page's signals."""
+        return bool(self._raw_pages) and (not self._planned or bool(self.policy.stop_when))
+
+    def next_url(self) -> str | None:
+        return self._pending.pop(0) if self._pending else None
+
+    def _signals_found(self) -> set[str]:
+        found = set()
+        if self._emails:
+            found.add("email")
+        if self._tech:
+            found.add("tech")
+        if self._compliance:
+            found.add("compliance")
+        if self._it_mention:
+            found.add("it_mention")
+        return found
+
+    def _plan_subpages(self, links: list[str]):
+        if self._planned:
+            return
+        self._planned = True
+        site = _site_host(self.url)
+        home = self.url.rstrip("/")
+        found = []
+        for href in links:
+            url = urldefrag(urljoin(self.url, href))[0]
+            if (
+                urlsplit(url).scheme in ("http", "https")
+                and _site_host(url) == site
+                and url.rstrip("/") != home
+                and url not in found
+            ):
+                found.append(url)
+        if found:
+            subpages = sorted(found, key=_subpage_rank)[:MAX_SUBPAGES]
+            self._pending += subpages
+            self.requests_saved = len(EXTRA_PATHS) - len(subpages)
+        else:
+            self._pending += [urljoin(self.url.rstrip("/") + "/", p.lstrip("/")) for p in EXTRA_PATHS]
+
+    def cached(self, page_url: str) -> dict | None:
+        """The page as an earlier crawl saw it; its validators make the re-fetch conditional."""
+        return self.pages.get(page_url) if self.pages is not None else None
+
+    def add_page(
+        self, page_url: str, content: bytes | None, encoding: str | None = None, truncated: bool = False,
+        validators: dict | None = None,
+    ):
+        """``content`` is None when the server answered 304 Not Modified."""
+        self.pages_fetched += 1
+        cached = self.cached(page_url)
+        digest = content_hash(content) if content is not None else None
+        if cached is not None and digest in (None, cached["hash"]):
+            if digest is None:
+                self.pages_not_modified += 1
+            else:
+                self.pages_unchanged += 1
+            # A 304 need not repeat the validators; keep the ones we have
+            fresh = {k: v for k, v in (validators or {}).items() if v}
+            self.pages.put(page_url, {**cached, **fresh})
+            self._truncated = self._truncated or cached["truncated"]
+            self._merge(page_url, cached["page"])
+            self._stop_if_satisfied()
+            return
+        entry = {**(validators or {}), "hash": digest, "truncated": truncated}
+        self._raw_pages.append((page_url, content or b"", encoding, entry))
+        self._truncated = self._truncated or truncated
+
+    def add_error(self, page_url: str, exc: Exception):
+        if isinstance(exc, HostUnreachable):
+            # Nothing more on this host can be fetched
+            if page_url == self.url:
+                self.result["scrape_status"] = exc.reason
+            self._pending = []
+            self._planned = True
+            return
+        if isinstance(exc, RobotsDisallowed):
+            if page_url == self.url:
+                self.result["scrape_status"] = "robots_disallowed"
+                self._plan_subpages([])
+            return
+        self.pages_fetched += 1
+        self._page_failed(page_url, exc)
+
+    def _page_failed(self, page_url: str, exc: Exception):
+        if page_url == self.url:
+            self.result["scrape_status"] = "not_html" if isinstance(exc, NotHtml) else "homepage_error"
+            self._plan_subpages([])
+
+    def parse(self):
+        """Parse the pages fetched since the last call."""
+        pages, self._raw_pages = self._raw_pages, []
+        if not pages:
+            return
+        signals = _extract_pages([(content, encoding) for _, content, encoding, _ in pages])
+        for (page_url, _, _, entry), page in zip(pages, signals):
+            if isinstance(page, Exception):
+                self._page_failed(page_url, page)
+                continue
+            if self.pages is not None:
+                self.pages.put(page_url, {**entry, "page": page})
+            self._merge(page_url, page)
+        self._stop_if_satisfied()
+
+    def _merge(self, page_url: str, page: dict):
+        """Add one page's signals; the homepage's links plan the subpages."""
+        self._emails.update(page["emails"])
+        self._tech.update(page["tech"])
+        self._compliance.update(page["compliance"])
+        self._it_mention = self._it_mention or page["it_mention"]
+        if page_url == self.url:
+            self._plan_subpages(page["links"])
+
+    def _stop_if_satisfied(self):
+        if self._planned and self._pending and self.policy.satisfied(self._signals_found()):
+            self.pages_skipped += len(self._pending)
+            self._pending = []
+
+    def finish(self) -> dict:
+        result = self.result
+        if not self.url:
+            return result
+
+        self.parse()
+        result["pages_fetched"] = self.pages_fetched
 
-    # 3. JSON-LD structured data
-    for script in soup.find_all("script", type="application/ld+json"):
         try:
-            ld_data = json.loads(script.string or "")
-            _extract_from_jsonld(ld_data, emails)
-        except (json.JSONDecodeError, TypeError):
-            pass
-
-    # 4. Meta tags
-    for meta in soup.find_all("meta"):
-        content = meta.get("content", "")
-        if content:
-            emails.update(re.findall(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", content))
-
-    # 5. De-obfuscation
-    if raw_html:
-        deobfuscated = raw_html.replace(" [at] ", "@").replace("(at)", "@").replace(" AT ", "@")
-        emails.update(re.findall(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", deobfuscated))
-
-    # Filter junk
-    junk_patterns = [
-        "example", "domain", "youremail", "sentry", "wixpress", "schema",
-        "placeholder", "test@", "noreply", "no-reply",
-    ]
-    emails = {e for e in emails if not any(x in e.lower() for x in junk_patterns)}
-    return emails
-
-
-def _extract_from_jsonld(data, emails: set):
-    """Recursively extract email fields from JSON-LD."""
-    if isinstance(data, dict):
-        for key in ("email", "contactPoint"):
-            if key in data:
-                val = data[key]
-                if isinstance(val, str) and "@" in val:
-                    emails.add(val.replace("mailto:", ""))
-                elif isinstance(val, (dict, list)):
-                    _extract_from_jsonld(val, emails)
-        for v in data.values():
-            if isinstance(v, (dict, list)):
-                _extract_from_jsonld(v, emails)
-    elif isinstance(data, list):
-        for item in data:
-            _extract_from_jsonld(item, emails)
-
-
-def detect_tech_stack(html: str) -> tuple:
-    """Returns (detected_techs: list, has_existing_msp: bool)."""
-    html_lower = html.lower()
-    detected = []
-    for tech, patterns in TECH_SIGNALS.items():
-        if any(p in html_lower for p in patterns):
-            detected.append(tech)
-    has_existing_msp = bool(set(detected) & MSP_TOOL_SIGNALS)
-    return detected, has_existing_msp
-
-
-def scrape_website(url: str) -> dict:
-    """Scrape homepage + contact/about pages for emails, tech, IT mentions, compliance."""
-    result = {
-        "emails_found": "",
-        "tech_stack": "",
-        "has_it_mention": False,
-        "has_existing_msp": False,
-        "compliance_mention": "",
-        "ssl_valid": False,
-        "scrape_status": "ok",
-    }
-
-    if not url:
-        result["scrape_status"] = "no_website"
-        return result
+            result["emails_found"] = "; ".join(sorted(self._emails)[:5])
 
-    all_emails = set()
-    all_html = ""
-    all_page_text = ""
+            # Tech stack
+            detected = [tech for tech in TECH_SIGNALS if tech in self._tech]
+            result["tech_stack"] = ", ".join(detected)
+            result["has_existing_msp"] = bool(self._tech & MSP_TOOL_SIGNALS)
 
-    urls_to_try = [url] + [urljoin(url.rstrip("/") + "/", p.lstrip("/")) for p in EXTRA_PATHS]
+            # IT staff mentions
+            result["has_it_mention"] = self._it_mention
 
-    for page_url in urls_to_try:
-        try:
-            resp = _request_with_retry(page_url, max_retries=2, timeout=10)
-            soup = BeautifulSoup(resp.text, "html.parser")
-            all_emails.update(_extract_emails_from_soup(soup, resp.text))
-            all_html += resp.text.lower() + " "
-            all_page_text += soup.get_text(separator=" ", strip=True).lower() + " "
-        except Exception:
-            if page_url == url:
-                result["scrape_status"] = "homepage_error"
+            # Compliance mentions
+            found_compliance = [kw for kw in COMPLIANCE_KEYWORDS if kw in self._compliance]
+            result["compliance_mention"] = ", ".join(found_compliance[:3]) if found_compliance else ""
 
-    try:
-        result["emails_found"] = "; ".join(sorted(all_emails)[:5])
+            # SSL check
+            result["ssl_valid"] = self.url.startswith("https://")
 
-        # Tech stack
-        detected, has_existing_msp = detect_tech_stack(all_html)
-        result["tech_stack"] = ", ".join(detected)
-        result["has_existing_msp"] = has_existing_msp
+            if self._truncated and result["scrape_status"] == "ok":
+                result["scrape_status"] = "truncated"
 
-        # IT staff mentions
-        result["has_it_mention"] = any(kw in all_page_text for kw in IT_KEYWORDS)
+        except Exception as e:
+            result["scrape_status"] = f"error: {str(e)[:60]}"
 
-        # Compliance mentions
-        found_compliance = [kw for kw in COMPLIANCE_KEYWORDS if kw in all_page_text]
-        result["compliance_mention"] = ", ".join(found_compliance[:3]) if found_compliance else ""
+        return result
 
-        # SSL check
-        result["ssl_valid"] = url.startswith("https://")
 
-    except Exception as e:
-        result["scrape_status"] = f"error: {str(e)[:60]}"
+def fetch_page(
+    page_url: str, ctx: CrawlContext, cached: dict | None = None,
+) -> tuple[bytes | None, str | None, bool, dict]:
+    """Stream one page; returns (body, encoding, truncated, validators) or raises NotHtml.
 
-    return result
+    With a ``cached`` entry the request is conditional, and the body is None
+    when the server answers 304 Not Modified.
+    """
+    resp = _request_with_retry(
+        page_url, max_retries=_PAGE_RETRIES, timeout=10, ctx=ctx, stream=True,
+        headers=conditional_headers(cached),
+    )
+    try:
+        if resp.status_code == 304:
+            return None, None, False, response_validators(resp.headers)
+        content_type = resp.headers.get("Content-Type")
+        if not is_html(content_type):
+            raise NotHtml(content_type)
+        content, truncated = read_capped(resp.iter_content(_CHUNK_SIZE), settings.max_page_bytes)
+        return content, resp.encoding, truncated, response_validators(resp.headers)
+    finally:
+        resp.close()
+
+
+def host_down(page_url: str, ctx: CrawlContext) -> HostUnreachable | None:
+    """The error to record instead of fetching, if the job's breaker refuses the host."""
+    reason = ctx.breaker.check(page_url)
+    if reason is None:
+        return None
+    ctx.stats.add(circuit_open_skips=1)
+    return HostUnreachable(reason, "circuit open")
+
+
+def record_fetch_error(
+    crawl: SiteCrawl, page_url: str, error: Exception, ctx: CrawlContext,
+    status: int | None = None, no_response: bool = False,
+):
+    """Breaker bookkeeping for a failed page fetch, shared by both engines, then record the error.
+
+    ``status`` is the HTTP status the host answered with and ``no_response``
+    means the request failed below HTTP (connection error or timeout). 5xx and
+    no response count against the host; any other answer (404, not HTML)
+    shows it is up.
+    """
+    if no_response:
+        ctx.breaker.record_failure(page_url, "connect_error")
+    elif status is not None and status >= 500:
+        ctx.breaker.record_failure(page_url, "server_error")
+    elif status is not None or isinstance(error, NotHtml):
+        ctx.breaker.record_success(page_url)
+    crawl.add_error(page_url, error)
+
+
+def _record_fetch_error(crawl: SiteCrawl, page_url: str, error: Exception, ctx: CrawlContext):
+    response = error.response if isinstance(error, requests.HTTPError) else None
+    record_fetch_error(
+        crawl, page_url, error, ctx,
+        status=response.status_code if response is not None else None,
+        no_response=isinstance(error, (requests.ConnectionError, requests.Timeout)),
+    )
+
+
+def robots_allow(page_url: str, rules, ctx: CrawlContext) -> bool:
+    """Apply the site's Crawl-delay to the job's throttle and check the page against its rules."""
+    delay = rules.crawl_delay(ROBOTS_AGENT)
+    if delay and float(delay) > ctx.throttle.min_interval:
+        ctx.throttle.set_interval(page_url, min(float(delay), settings.max_crawl_delay))
+    if rules.can_fetch(ROBOTS_AGENT, page_url):
+        return True
+    ctx.stats.add(robots_disallowed=1)
+    return False
+
+
+def robots_verdict(page_url: str, ctx: CrawlContext) -> bool | None:
+    """Whether the page may be fetched, or None if the site's robots.txt has to be fetched first."""
+    if not settings.respect_robots:
+        return True
+    rules = ctx.robots.get(page_url)
+    return None if rules is None else robots_allow(page_url, rules, ctx)
+
+
+def record_robots(page_url: str, ctx: CrawlContext, status: int | None, body: bytes) -> bool:
+    """Keep the site's robots.txt response (``status`` None = no response) and check the page against it."""
+    if status is not None:
+        ctx.stats.add(robots_fetched=1)
+    text = body[:ROBOTS_MAX_BYTES].decode("utf-8", errors="replace")
+    return robots_allow(page_url, ctx.robots.put(page_url, status, text), ctx)
+
+
+def _fetch_robots(page_url: str, ctx: CrawlContext) -> tuple[int | None, bytes]:
+    """(status, body) of the site's robots.txt; status is None when there was no response."""
+    url = robots_url(page_url)
+    ctx.wait_for_host(url)
+    try:
+        with ctx.profiler.stage("robots") as stage:
+            if ctx.http is not None:
+                resp = ctx.http.get(url, timeout=5, allow_redirects=True, stream=True)
+            else:
+                resp = requests.get(url, headers=HEADERS, timeout=5, allow_redirects=True, stream=True)
+            try:
+                body, _ = read_capped(resp.iter_content(_CHUNK_SIZE), ROBOTS_MAX_BYTES)
+            finally:
+                resp.close()
+            stage.add_bytes(len(body))
+    except requests.RequestException:
+        return None, b""
+    return resp.status_code, body
+
+
+def _robots_allow(page_url: str, ctx: CrawlContext) -> bool:
+    allowed = robots_verdict(page_url, ctx)
+    if allowed is None:
+        allowed = record_robots(page_url, ctx, *_fetch_robots(page_url, ctx))
+    return allowed
+
+
+def wants_probe(crawl: SiteCrawl) -> bool:
+    return bool(crawl.url) and settings.host_probe_timeout > 0
+
+
+def record_unreachable(crawl: SiteCrawl, ctx: CrawlContext, error: HostUnreachable, probe_seconds: float):
+    """Skip a site whose probe failed, and mark its host dead for the rest of the job."""
+    log.info(f"Skipping {crawl.url}: {error}")
+    crawl.add_error(crawl.url, error)
+    ctx.breaker.mark_dead(crawl.url, error.reason)
+    ctx.stats.add(
+        sites_unreachable=1, probe_seconds_saved=round(dead_site_cost(probe_seconds) - probe_seconds, 1),
+    )
+
+
+def _probe_site(crawl: SiteCrawl, ctx: CrawlContext):
+    if not wants_probe(crawl):
+        return
+    started = time.perf_counter()
+    try:
+        with ctx.profiler.stage("probe"):
+            probe_host(crawl.url, settings.host_probe_timeout)
+    except HostUnreachable as e:
+        record_unreachable(crawl, ctx, e, time.perf_counter() - started)
+
+
+def fetch_site(crawl: SiteCrawl, ctx: CrawlContext):
+    """Fetch every page ``crawl`` asks for without parsing them.
+
+    The homepage's host is checked against the job's breaker and probed first;
+    each subpage is checked again, so a host that keeps failing mid-crawl is
+    dropped without further retries. Pages the site's robots.txt disallows
+    are skipped, and pages in ``ctx.pages`` are re-fetched conditionally.
+    """
+    if crawl.url:
+        refused = host_down(crawl.url, ctx)
+        if refused is not None:
+            crawl.add_error(crawl.url, refused)
+        else:
+            _probe_site(crawl, ctx)
+    while (page_url := crawl.next_url()) is not None:
+        if page_url != crawl.url and (refused := host_down(page_url, ctx)) is not None:
+            crawl.add_error(page_url, refused)
+            continue
+        try:
+            if not _robots_allow(page_url, ctx):
+                crawl.add_error(page_url, RobotsDisallowed(page_url))
+                continue
+            ctx.wait_for_host(page_url)
+            with ctx.profiler.stage("fetch") as stage:
+                content, encoding, truncated, validators = fetch_page(page_url, ctx, crawl.cached(page_url))
+                stage.add_bytes(len(content or b""))
+            ctx.breaker.record_success(page_url)
+            crawl.add_page(page_url, content, encoding, truncated, validators)
+            if crawl.needs_parse:
+                with ctx.profiler.stage("parse"):
+                    crawl.parse()
+        except JobCancelled:
+            raise
+        except Exception as e:
+            _record_fetch_error(crawl, page_url, e, ctx)
+    ctx.stats.add(
+        subpage_requests_saved=crawl.requests_saved, subpages_skipped=crawl.pages_skipped,
+        pages_not_modified=crawl.pages_not_modified, pages_unchanged=crawl.pages_unchanged,
+    )
+
+
+def scrape_website(url: str, ctx: CrawlContext | None = None) -> dict:
+    """Scrape homepage + contact/about pages for emails, tech, IT mentions, compliance.
+
+    Inside a job, ``ctx`` spaces requests per host and raises JobCancelled
+    between pages or during backoff once the job is cancelled.
+    """
+    ctx = ctx or CrawlContext()
+    crawl = SiteCrawl(url, ctx.policy, ctx.pages)
+    fetch_site(crawl, ctx)
+    with ctx.profiler.stage("parse"):
+        return crawl.finish()
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.cache import CacheEntry
@@ -18,6 +20,11 @@ TTL_SEARCH = 24 * 7         # 7 days
 TTL_WEBSITE = 24 * 3        # 3 days
 TTL_ENRICHMENT = 24 * 30    # 30 days
 
+# INSERT ... ON CONFLICT DO UPDATE constructs for the databases that have one
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+# Rows per upsert statement, well under SQLite's bound-parameter limit
+_UPSERT_BATCH = 500
+
 
 class CacheService:
     def __init__(self, db: Session):
@@ -33,26 +40,68 @@ class CacheService:
             return None
         return json.loads(entry.data)
 
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Unexpired entries among ``keys`` in one query; missing keys are left out."""
+        if not keys:
+            return {}
+        now = datetime.now(timezone.utc)
+        rows = (
+            self.db.query(CacheEntry.key, CacheEntry.data)
+            .filter(
+                CacheEntry.key.in_(keys),
+                (CacheEntry.expires_at.is_(None)) | (CacheEntry.expires_at > now),
+            )
+            .all()
+        )
+        return {key: json.loads(data) for key, data in rows}
+
     def set(self, key: str, cache_type: str, data: Any, ttl_hours: int = 24 * 7):
-        existing = self.db.query(CacheEntry).filter(CacheEntry.key == key).first()
+        self.set_many({key: data}, cache_type, ttl_hours)
+
+    def set_many(self, items: dict[str, Any], cache_type: str, ttl_hours: float = 24 * 7):
+        """Insert or refresh several entries of one type in a single commit.
+
+        Written as an upsert, so jobs finishing together with overlapping keys
+        both succeed (the last one wins) instead of one failing on the unique key.
+        """
+        if not items:
+            return
         now = datetime.now(timezone.utc)
         expires = now + timedelta(hours=ttl_hours)
-
-        if existing:
-            existing.data = json.dumps(data, default=str)
-            existing.created_at = now
-            existing.expires_at = expires
+        rows = [
+            {
+                "key": key,
+                "cache_type": cache_type,
+                "data": json.dumps(data, default=str),
+                "created_at": now,
+                "expires_at": expires,
+            }
+            for key, data in items.items()
+        ]
+        insert = _UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if insert is None:
+            for row in rows:
+                self._upsert_one(row)
         else:
-            entry = CacheEntry(
-                key=key,
-                cache_type=cache_type,
-                data=json.dumps(data, default=str),
-                created_at=now,
-                expires_at=expires,
-            )
-            self.db.add(entry)
+            for i in range(0, len(rows), _UPSERT_BATCH):
+                stmt = insert(CacheEntry).values(rows[i:i + _UPSERT_BATCH])
+                self.db.execute(stmt.on_conflict_do_update(
+                    index_elements=[CacheEntry.key],
+                    set_={name: stmt.excluded[name] for name in ("data", "created_at", "expires_at")},
+                ))
         self.db.commit()
 
+    def _upsert_one(self, row: dict):
+        """Upsert for dialects without ON CONFLICT: insert under a savepoint, update on a clash."""
+        try:
+            with self.db.begin_nested():
+                self.db.add(CacheEntry(**row))
+        except IntegrityError:
+            self.db.query(CacheEntry).filter(CacheEntry.key == row["key"]).update(
+                {name: row[name] for name in ("data", "created_at", "expires_at")},
+                synchronize_session=False,
+            )
+
     def clear(self, cache_type: str | None = None) -> int:
         query = self.db.query(CacheEntry)
         if cache_type:
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.jobs.interface import JobHandle, JobRunner
+from app.jobs.ownership import JobOwnedElsewhere, claim_job
+from app.jobs.scheduler import JobQueueFull
+from app.models.scrape_job import JobStatus, ScrapeJob
+from app.models.user import User
+from app.scraper.constants import VERTICALS
+from app.scraper.async_pipeline import AsyncScrapeOrchestrator
+from app.scraper.pipeline import ScrapeOrchestrator
+
+log = logging.getLogger(__name__)
+
+# Jobs in these states have no live worker after a restart and can pick up from their checkpoint
+RESUMABLE_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING, JobStatus.FAILED)
+
+
+def user_api_keys(user: User) -> dict:
+    """Get API keys from user settings, falling back to server config."""
+    user_keys = json.loads(user.api_keys_json or "{}")
+    return {
+        "serper_key": user_keys.get("serper_key") or settings.serper_key,
+        "serpapi_key": user_keys.get("serpapi_key") or settings.serpapi_key,
+        "hunter_key": user_keys.get("hunter_key") or settings.hunter_key,
+        "apollo_key": user_keys.get("apollo_key") or settings.apollo_key,
+    }
+
+
+def user_scoring_weights(user: User) -> dict | None:
+    """Get scoring weights from user settings."""
+    weights = json.loads(user.scoring_weights_json or "{}")
+    return weights if weights else None
+
+
+def batch_queries(categories: list[str], sector: str | None, locations: list[str]) -> list[dict]:
+    """Expand a batch request into its category/location searches, in run order.
+
+    Raises ValueError for an unknown sector, an empty expansion, or more
+    searches than ``max_batch_queries``.
+    """
+    categories = list(categories)
+    if sector:
+        in_sector = [name for name, meta in VERTICALS.items() if meta["sector"].lower() == sector.lower()]
+        if not in_sector:
+            raise ValueError(f"Unknown sector: {sector}")
+        categories += in_sector
+    categories = list(dict.fromkeys(c.strip() for c in categories if c.strip()))
+    locations = list(dict.fromkeys(loc.strip() for loc in locations if loc.strip()))
+    if not categories or not locations:
+        raise ValueError("A batch needs at least one category and one location")
+    if len(categories) * len(locations) > settings.max_batch_queries:
+        raise ValueError(f"A batch may run at most {settings.max_batch_queries} searches")
+    # Location-major, so every search for a location runs before moving on
+    return [{"category": c, "location": loc} for loc in locations for c in categories]
+
+
+def _job_kwargs(job: ScrapeJob) -> dict:
+    return {
+        "category": job.category,
+        "location": job.location,
+        "num_results": job.num_results_requested,
+        "delay": job.delay,
+        "concurrency": job.concurrency,
+    }
+
+
+def _build_orchestrator(cls: type, db: Session, job: ScrapeJob):
+    from app.dependencies import get_cancellation_registry, get_event_bus
+
+    return cls(
+        db=db,
+        event_bus=get_event_bus(),
+        api_keys=user_api_keys(job.user),
+        scoring_weights=user_scoring_weights(job.user),
+        cancel_token=get_cancellation_registry().token_for(job.id),
+    )
+
+
+def _release(job_id: int):
+    from app.dependencies import get_cancellation_registry
+
+    get_cancellation_registry().release(job_id)
+
+
+def run_scrape_job(job_id: int):
+    """Job entry point for the thread engine. Everything is loaded from the job row,
+    so the same call starts a new job or resumes one from its checkpoint."""
+    db = SessionLocal()
+    try:
+        job = db.query(ScrapeJob).get(job_id)
+        _build_orchestrator(ScrapeOrchestrator, db, job).run(job_id=job_id, **_job_kwargs(job))
+    finally:
+        _release(job_id)
+        db.close()
+
+
+async def run_scrape_job_async(job_id: int):
+    """Job entry point for the async engine."""
+    db = SessionLocal()
+    try:
+        # Keep DB work off the event loop every async job shares
+        job = await asyncio.to_thread(db.query(ScrapeJob).get, job_id)
+        orchestrator = await asyncio.to_thread(_build_orchestrator, AsyncScrapeOrchestrator, db, job)
+        await orchestrator.run_async(job_id=job_id, **_job_kwargs(job))
+    finally:
+        _release(job_id)
+        await asyncio.to_thread(db.close)
+
+
+def job_entrypoint() -> Callable:
+    return run_scrape_job_async if settings.scrape_engine == "async" else run_scrape_job
+
+
+def submit_scrape_job(db: Session, job: ScrapeJob, job_runner: JobRunner) -> JobHandle:
+    """Hand the job to the runner.
+
+    The in-memory runner first claims the job for this process and raises
+    JobOwnedElsewhere if another live API process runs or queues it; the
+    database queue dedupes jobs itself.
+    """
+    if settings.job_queue != "database" and not claim_job(db, job.id, settings.job_lease_seconds):
+        raise JobOwnedElsewhere(job.id)
+    return job_runner.submit(job_entrypoint(), job_id=job.id, user_id=job.user_id)
+
+
+def resume_interrupted_jobs(job_runner: JobRunner) -> list[int]:
+    """Resubmit jobs left PENDING or RUNNING by a process that is gone.
+
+    With the in-memory runner a job is only taken over once its owner has
+    stopped heartbeating for ``job_lease_seconds``, so jobs a sibling API
+    process is still running or queueing are left alone. Called on startup
+    and from the ownership heartbeat, which picks up jobs whose owner died
+    since.
+    """
+    db = SessionLocal()
+    try:
+        jobs = (
+            db.query(ScrapeJob)
+            .filter(ScrapeJob.status.in_([JobStatus.PENDING, JobStatus.RUNNING]))
+            .order_by(ScrapeJob.created_at)
+            .all()
+        )
+        resumed = []
+        for job in jobs:
+            if job_runner.is_running(job.id):
+                continue
+            try:
+                submit_scrape_job(db, job, job_runner)
+            except JobOwnedElsewhere:
+                continue
+            except JobQueueFull:
+                log.warning("Job queue is full; the remaining interrupted jobs can be resumed later")
+                break
+            log.info(f"Resumed interrupted scrape job {job.id}")
+            resumed.append(job.id)
+        return resumed
+    finally:
+        db.close()
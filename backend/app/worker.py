@@ -0,0 +1,182 @@
+"""Standalone scrape worker: ``python -m app.worker``.
+
+With JOB_QUEUE=database the API only queues jobs; workers claim them with a
+lease and run them with the configured SCRAPE_ENGINE. Run as many worker
+processes as the host can take, independently of the API workers.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from app.config import settings
+from app.database import SessionLocal, create_tables
+from app.dependencies import get_cancellation_registry, get_job_runner
+from app.jobs.db_runner import DatabaseJobRunner, resolve_entrypoint
+from app.models.job_queue import QueuedJob
+from app.models.scrape_job import JobStatus, ScrapeJob
+from app.scraper.parse_pool import shutdown_parse_pool
+from app.scraper.providers import close_providers, provider_stats
+
+log = logging.getLogger(__name__)
+
+
+class Worker:
+    """Claims queued jobs and runs each in its own thread, up to ``concurrency`` at once."""
+
+    def __init__(
+        self,
+        runner: DatabaseJobRunner,
+        name: str,
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+        max_attempts: int = 3,
+    ):
+        self.runner = runner
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._active: dict[int, threading.Thread] = {}
+        # Jobs whose lease another worker took over; their threads are winding down
+        self._lost: set[int] = set()
+        self._lost_lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def run(self):
+        log.info(f"Worker {self.name} started, running up to {self.concurrency} jobs")
+        last_renewal = time.monotonic()
+        while not self._stopping.is_set():
+            try:
+                self._reap()
+                self._claim_jobs()
+                if time.monotonic() - last_renewal >= self.runner.lease_seconds / 3:
+                    self._renew_leases()
+                    last_renewal = time.monotonic()
+                self._watch_cancellations()
+            except Exception as e:
+                log.error(f"Worker {self.name} poll failed: {e}", exc_info=e)
+            self._stopping.wait(self.poll_interval)
+        self._shutdown()
+
+    def stop(self, *_):
+        self._stopping.set()
+
+    def _reap(self):
+        for job_id, thread in list(self._active.items()):
+            if not thread.is_alive():
+                del self._active[job_id]
+
+    def _claim_jobs(self):
+        while len(self._active) < self.concurrency:
+            queued = self.runner.claim(self.name, settings.max_running_jobs_per_user)
+            if queued is None:
+                return
+            thread = threading.Thread(
+                target=self._run, args=(queued,), daemon=True, name=f"scrape-job-{queued.job_id}",
+            )
+            self._active[queued.job_id] = thread
+            thread.start()
+
+    def _run(self, queued: QueuedJob):
+        job_id = queued.job_id
+        try:
+            if queued.attempts > self.max_attempts:
+                self._give_up(job_id, queued.attempts - 1)
+                return
+            log.info(f"Worker {self.name} running job {job_id} (attempt {queued.attempts})")
+            func = resolve_entrypoint(queued.entrypoint)
+            if inspect.iscoroutinefunction(func):
+                asyncio.run(func(job_id=job_id))
+            else:
+                func(job_id=job_id)
+        except Exception as e:
+            log.error(f"Job {job_id} failed: {e}", exc_info=e)
+        finally:
+            with self._lost_lock:
+                lost = job_id in self._lost
+                self._lost.discard(job_id)
+            if not lost:
+                self.runner.release(self.name, job_id, finished=True)
+
+    def _give_up(self, job_id: int, attempts: int):
+        db = SessionLocal()
+        try:
+            job = db.query(ScrapeJob).get(job_id)
+            if job is not None and job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+                job.status = JobStatus.FAILED
+                job.error_message = f"Worker stopped during each of {attempts} attempts"
+                db.commit()
+        finally:
+            db.close()
+
+    def _renew_leases(self):
+        for job_id in self.runner.renew(self.name, list(self._active)):
+            # Another worker may already be running it: stop ours without writing the job's status
+            log.warning(f"Worker {self.name} lost the lease on job {job_id}, abandoning it")
+            with self._lost_lock:
+                self._lost.add(job_id)
+            self._active.pop(job_id, None)
+            get_cancellation_registry().abandon(job_id)
+
+    def _watch_cancellations(self):
+        """Cancel requests arrive as the job's CANCELLED status, set by the API process."""
+        if not self._active:
+            return
+        db = SessionLocal()
+        try:
+            cancelled = db.query(ScrapeJob.id).filter(
+                ScrapeJob.id.in_(list(self._active)), ScrapeJob.status == JobStatus.CANCELLED,
+            )
+            for (job_id,) in cancelled:
+                get_cancellation_registry().cancel(job_id)
+        finally:
+            db.close()
+
+    def _shutdown(self):
+        # Hand unfinished jobs straight back; they resume from their checkpoints elsewhere
+        unfinished = [job_id for job_id, thread in self._active.items() if thread.is_alive()]
+        for job_id in unfinished:
+            self.runner.release(self.name, job_id, finished=False)
+        log.info(f"Worker {self.name} stopped, released {len(unfinished)} unfinished job(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scrape jobs queued in the database.")
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency)
+    parser.add_argument("--name", default=f"{socket.gethostname()}:{os.getpid()}")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    runner = get_job_runner()
+    if not isinstance(runner, DatabaseJobRunner):
+        parser.error("workers need JOB_QUEUE=database")
+    create_tables()
+
+    worker = Worker(
+        runner,
+        name=args.name,
+        concurrency=args.concurrency,
+        poll_interval=settings.worker_poll_interval,
+        max_attempts=settings.job_max_attempts,
+    )
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    try:
+        worker.run()
+    finally:
+        shutdown_parse_pool()
+        if stats := provider_stats():
+            log.info(f"Provider API usage: {stats}")
+        close_providers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Pages for the extraction benchmarks.
+
+Pass ``--corpus DIR`` to benchmark saved pages (``*.html``, raw bytes as
+fetched). Without it a synthetic small-business corpus is generated: headers,
+navigation, copy mentioning IT and compliance terms, vendor script tags,
+JSON-LD, mailto links, obfuscated addresses and the usual inline scripts.
+"""
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+from app.scraper.constants import COMPLIANCE_KEYWORDS, IT_KEYWORDS, TECH_SIGNALS
+
+_WORDS = (
+    "our team family owned serving the community since patients clients care quality "
+    "service appointment schedule call today friendly staff experience trusted local "
+    "office hours location directions insurance accepted new customers welcome about us"
+).split()
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    text = [rng.choice(_WORDS) for _ in range(words)]
+    if rng.random() < 0.3:
+        text.insert(rng.randrange(len(text)), rng.choice(IT_KEYWORDS))
+    if rng.random() < 0.3:
+        text.insert(rng.randrange(len(text)), rng.choice(COMPLIANCE_KEYWORDS).strip())
+    return " ".join(text).capitalize() + "."
+
+
+def synthetic_page(rng: random.Random, n: int) -> bytes:
+    domain = f"business{n}.com"
+    signals = rng.sample([p for patterns in TECH_SIGNALS.values() for p in patterns], rng.randint(1, 6))
+    scripts = "".join(f'<script src="https://cdn.{s.replace(" ", "")}/app.js"></script>' for s in signals)
+    jsonld = json.dumps({
+        "@context": "https://schema.org", "@type": "LocalBusiness", "name": f"Business {n}",
+        "email": f"office@{domain}", "contactPoint": {"@type": "ContactPoint", "email": f"billing@{domain}"},
+    })
+    nav = "".join(f'<li><a href="/{w}">{w.title()}</a></li>' for w in rng.sample(_WORDS, 6))
+    sections = "".join(
+        f"<section><h2>{rng.choice(_WORDS).title()}</h2>"
+        + "".join(f"<p>{_paragraph(rng, rng.randint(20, 80))}</p>" for _ in range(rng.randint(2, 6)))
+        + "</section>"
+        for _ in range(rng.randint(3, 12))
+    )
+    inline = "var cfg = {dsn: 'https://abc@sentry.io/1', user: 'placeholder@" + domain + "'};" * rng.randint(5, 40)
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8">
+<title>Business {n}</title>
+<meta name="description" content="Contact us at hello@{domain} for appointments">
+<meta property="og:email" content="front.desk@{domain}">
+{scripts}
+<script type="application/ld+json">{jsonld}</script>
+<style>body {{ font-family: sans-serif; }} .hero {{ color: #333; }}</style>
+</head><body>
+<header><nav><ul>{nav}</ul></nav></header>
+<!-- page built by site builder -->
+<main class="hero">{sections}</main>
+<noscript><p>Enable JavaScript for booking: noscript@{domain}</p></noscript>
+<script>{inline}</script>
+<footer><p>Email <a href="mailto:info@{domain}?subject=Hello">info@{domain}</a>
+or write to manager [at] {domain} &middot; noreply@{domain}</p></footer>
+</body></html>""".encode("utf-8")
+
+
+def load_corpus(path: str | None = None, pages: int = 200, seed: int = 0) -> list[tuple[str, bytes, str | None]]:
+    """(name, body, encoding) triples; saved pages are decoded as UTF-8 like headerless responses."""
+    if path:
+        files = sorted(Path(path).glob("*.html"))
+        return [(f.name, f.read_bytes(), None) for f in files]
+    rng = random.Random(seed)
+    return [(f"synthetic-{n}", synthetic_page(rng, n), "utf-8") for n in range(pages)]
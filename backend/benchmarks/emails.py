@@ -0,0 +1,70 @@
+"""Email extraction cost: the old findall-and-any() pass vs the prefiltered path.
+
+    python -m benchmarks.emails [--corpus DIR] [--pages N] [--repeat R]
+
+Run from backend/. Each page is parsed and walked once up front; only the
+email stage (visible-text scan, de-obfuscated markup scan, junk filter) is
+timed. Results are checked to be identical per page, and ``find_emails`` is
+checked against ``EMAIL_RE.findall`` on every text scanned.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.scraper.extraction import EMAIL_RE, _parse, _walk, collect_emails, find_emails
+from benchmarks import reference
+from benchmarks.corpus import load_corpus
+
+
+def _prepare(corpus) -> list[tuple[str, str, str, set]]:
+    pages = []
+    for name, body, encoding in corpus:
+        html = body.decode(encoding or "utf-8", errors="replace")
+        walked = set()
+        root = _parse(html)
+        visible_text = _walk(root, walked) if root is not None else ""
+        pages.append((name, html, visible_text, walked))
+    return pages
+
+
+def _best(func, pages, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        for _, html, visible_text, walked in pages:
+            func(html, visible_text, set(walked))
+        best = min(best, time.process_time() - start)
+    return best / len(pages) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved *.html pages (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=200, help="synthetic pages to generate")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs; the best is reported")
+    args = parser.parse_args()
+
+    pages = _prepare(load_corpus(args.corpus, args.pages))
+    print(f"{len(pages)} pages\n")
+
+    mismatched = [name for name, html, visible_text, _ in pages
+                  if any(find_emails(t) != EMAIL_RE.findall(t) for t in (html, visible_text))]
+    differing = [name for name, html, visible_text, walked in pages
+                 if reference.collect_emails(html, visible_text, set(walked))
+                 != collect_emails(html, visible_text, set(walked))]
+
+    old_ms = _best(reference.collect_emails, pages, args.repeat)
+    new_ms = _best(collect_emails, pages, args.repeat)
+    print(f"{'path':<22}{'CPU ms/page':>14}")
+    print(f"{'findall + any()':<22}{old_ms:>14.3f}")
+    print(f"{'prefiltered':<22}{new_ms:>14.3f}")
+    print(f"\nspeedup {old_ms / new_ms:.1f}x")
+    print(f"find_emails differs from findall on {len(mismatched)} pages"
+          + (f": {mismatched[:10]}" if mismatched else ""))
+    print(f"results differ on {len(differing)} of {len(pages)} pages"
+          + (f": {differing[:10]}" if differing else ""))
+
+
+if __name__ == "__main__":
+    main()
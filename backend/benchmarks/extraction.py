@@ -0,0 +1,68 @@
+"""Per-page CPU time and peak memory of page extraction, old engine vs new.
+
+    python -m benchmarks.extraction [--corpus DIR] [--pages N] [--repeat R]
+
+Run from backend/. Also reports pages whose results differ between engines.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from app.scraper.extraction import extract_page
+from benchmarks import reference
+from benchmarks.corpus import load_corpus
+
+
+def _time_per_page(func, corpus, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        for _, body, encoding in corpus:
+            func(body, encoding)
+        best = min(best, time.process_time() - start)
+    return best / len(corpus)
+
+
+def _peak_per_page(func, corpus) -> float:
+    peaks = []
+    for _, body, encoding in corpus:
+        tracemalloc.start()
+        func(body, encoding)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved *.html pages (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=200, help="synthetic pages to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs; the best is reported")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.pages)
+    kib = sum(len(body) for _, body, _ in corpus) / len(corpus) / 1024
+    print(f"{len(corpus)} pages, {kib:.1f} KiB average\n")
+
+    rows = []
+    for name, func in (("bs4 (old)", reference.extract_page), ("lxml single pass", extract_page)):
+        rows.append((name, _time_per_page(func, corpus, args.repeat) * 1000, _peak_per_page(func, corpus) / 1024))
+    print(f"{'engine':<18}{'CPU ms/page':>14}{'peak KiB/page':>16}")
+    for name, ms, peak in rows:
+        print(f"{name:<18}{ms:>14.2f}{peak:>16.0f}")
+    (_, old_ms, old_peak), (_, new_ms, new_peak) = rows
+    print(f"\nspeedup {old_ms / new_ms:.1f}x, peak memory {new_peak / old_peak:.0%} of old")
+
+    def differs(body, encoding) -> bool:
+        old = reference.extract_page(body, encoding)
+        new = extract_page(body, encoding)
+        return any(old[key] != new[key] for key in old)
+
+    differing = [name for name, body, encoding in corpus if differs(body, encoding)]
+    print(f"results differ on {len(differing)} of {len(corpus)} pages" + (f": {differing[:10]}" if differing else ""))
+
+
+if __name__ == "__main__":
+    main()
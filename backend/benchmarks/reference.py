@@ -0,0 +1,105 @@
+"""The BeautifulSoup page extraction the scraper used before the lxml engine.
+
+Kept only as a baseline for the benchmarks: same inputs and output shape as
+``app.scraper.extraction.extract_page``.
+"""
+from __future__ import annotations
+
+import json
+import re
+
+from bs4 import BeautifulSoup
+
+from app.scraper.constants import COMPLIANCE_KEYWORDS, IT_KEYWORDS, MSP_TOOL_SIGNALS, TECH_SIGNALS
+
+
+def _extract_from_jsonld(data, emails: set):
+    if isinstance(data, dict):
+        for key in ("email", "contactPoint"):
+            if key in data:
+                val = data[key]
+                if isinstance(val, str) and "@" in val:
+                    emails.add(val.replace("mailto:", ""))
+                elif isinstance(val, (dict, list)):
+                    _extract_from_jsonld(val, emails)
+        for v in data.values():
+            if isinstance(v, (dict, list)):
+                _extract_from_jsonld(v, emails)
+    elif isinstance(data, list):
+        for item in data:
+            _extract_from_jsonld(item, emails)
+
+
+def extract_emails_from_soup(soup: BeautifulSoup, raw_html: str = "") -> set:
+    for tag in soup.find_all(["script", "style", "noscript"]):
+        if tag.get("type") != "application/ld+json":
+            tag.decompose()
+
+    emails = set()
+    visible_text = soup.get_text(separator=" ", strip=True)
+    emails.update(re.findall(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", visible_text))
+
+    for a_tag in soup.find_all("a", href=True):
+        href = a_tag["href"]
+        if href.startswith("mailto:"):
+            email = href.replace("mailto:", "").split("?")[0].strip()
+            if "@" in email:
+                emails.add(email)
+
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            ld_data = json.loads(script.string or "")
+            _extract_from_jsonld(ld_data, emails)
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+    for meta in soup.find_all("meta"):
+        content = meta.get("content", "")
+        if content:
+            emails.update(re.findall(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", content))
+
+    if raw_html:
+        deobfuscated = raw_html.replace(" [at] ", "@").replace("(at)", "@").replace(" AT ", "@")
+        emails.update(re.findall(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", deobfuscated))
+
+    junk_patterns = [
+        "example", "domain", "youremail", "sentry", "wixpress", "schema",
+        "placeholder", "test@", "noreply", "no-reply",
+    ]
+    return {e for e in emails if not any(x in e.lower() for x in junk_patterns)}
+
+
+def detect_tech_stack(html: str) -> tuple:
+    html_lower = html.lower()
+    detected = []
+    for tech, patterns in TECH_SIGNALS.items():
+        if any(p in html_lower for p in patterns):
+            detected.append(tech)
+    return detected, bool(set(detected) & MSP_TOOL_SIGNALS)
+
+
+def extract_page(content: bytes, encoding: str | None = None) -> dict:
+    html = content.decode(encoding or "utf-8", errors="replace")
+    soup = BeautifulSoup(html, "html.parser")
+    emails = extract_emails_from_soup(soup, html)
+    page_text = soup.get_text(separator=" ", strip=True).lower()
+    detected, _ = detect_tech_stack(html)
+    return {
+        "emails": sorted(emails),
+        "tech": detected,
+        "it_mention": any(kw in page_text for kw in IT_KEYWORDS),
+        "compliance": [kw for kw in COMPLIANCE_KEYWORDS if kw in page_text],
+    }
+
+
+def collect_emails(raw_html: str, visible_text: str, emails: set) -> set:
+    """The regex and junk-filter tail of ``extract_emails_from_soup``, on pre-walked input."""
+    emails.update(re.findall(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", visible_text))
+    deobfuscated = raw_html.replace(" [at] ", "@").replace("(at)", "@").replace(" AT ", "@")
+    emails.update(re.findall(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", deobfuscated))
+
+    junk_patterns = [
+        "example", "domain", "youremail", "sentry", "wixpress", "schema",
+        "placeholder", "test@", "noreply", "no-reply",
+    ]
+    return {e for e in emails if not any(x in e.lower() for x in junk_patterns)}
@@ -0,0 +1,64 @@
+"""CacheService.set_many from several sessions writing the same keys."""
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.cache import CacheEntry
+from app.services.cache_service import CacheService
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'cache.db'}", connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(engine, tables=[CacheEntry.__table__])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_second_session_refreshes_the_key(sessions):
+    first, second = sessions(), sessions()
+    CacheService(first).set_many({"dead:a.com": {"by": "first"}, "dead:b.com": 1}, "dead")
+    CacheService(second).set_many({"dead:a.com": {"by": "second"}, "dead:c.com": 2}, "dead")
+
+    check = sessions()
+    assert CacheService(check).get_many(["dead:a.com", "dead:b.com", "dead:c.com"]) == {
+        "dead:a.com": {"by": "second"}, "dead:b.com": 1, "dead:c.com": 2,
+    }
+    assert check.query(CacheEntry).count() == 3
+
+
+def test_concurrent_sessions_writing_the_same_keys(sessions):
+    rounds, writers = 30, 2
+    barrier = threading.Barrier(writers)
+    errors = []
+
+    def write(n: int):
+        db = sessions()
+        try:
+            for r in range(rounds):
+                barrier.wait()
+                CacheService(db).set_many(
+                    {f"dead:shared-{r}.com": n, f"dead:own-{n}-{r}.com": n}, "dead",
+                )
+        except Exception as e:
+            errors.append(e)
+            barrier.abort()
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    check = sessions()
+    assert check.query(CacheEntry).count() == rounds * (1 + writers)
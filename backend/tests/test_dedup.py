@@ -0,0 +1,46 @@
+"""dedupe_places merges the same business found by several searches, and only that."""
+from __future__ import annotations
+
+from app.scraper.dedup import dedupe_places
+
+
+def _place(name: str, website: str = "", address: str = "", maps: str = "", phone: str = "") -> dict:
+    return {"business_name": name, "website": website, "address": address, "google_maps_url": maps, "phone": phone}
+
+
+def test_same_name_in_different_locations_stays_apart():
+    kept, saved = dedupe_places([
+        _place("Tech Solutions", address="100 Main St, Austin, TX"),
+        _place("Tech Solutions", address="42 Elm Ave, Denver, CO"),
+        _place("Tech Solutions"),
+    ])
+    assert [i for i, _ in kept] == [0, 1, 2]
+    assert saved == 0
+
+
+def test_same_name_at_the_same_address_is_merged():
+    kept, _ = dedupe_places([
+        _place("Tech Solutions", address="100 Main St, Austin, TX"),
+        _place("TECH SOLUTIONS!", address="100 Main St., Austin TX", phone="555-0100"),
+    ])
+    assert [i for i, _ in kept] == [0]
+    assert kept[0][1]["phone"] == "555-0100"
+
+
+def test_same_maps_place_is_merged_whatever_its_address():
+    kept, _ = dedupe_places([
+        _place("Tech Solutions", maps="123456"),
+        _place("Tech Solutions LLC", address="100 Main St, Austin, TX", maps="123456"),
+    ])
+    assert [i for i, _ in kept] == [0]
+    assert kept[0][1]["address"] == "100 Main St, Austin, TX"
+
+
+def test_places_with_a_website_are_merged_by_domain():
+    kept, saved = dedupe_places([
+        _place("Acme IT", website="https://www.acme.com/", address="1 First St, Austin, TX"),
+        _place("Acme IT Services", website="http://acme.com/contact", address="9 Ninth St, Dallas, TX"),
+        _place("Acme IT", address="1 First St, Austin, TX"),
+    ])
+    assert [i for i, _ in kept] == [0]
+    assert saved == 1
@@ -0,0 +1,116 @@
+"""In-memory runner jobs are only resumed by another API process once their owner is gone."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.jobs import ownership
+from app.jobs.interface import JobHandle, JobRunner
+from app.jobs.ownership import OwnerHeartbeat, claim_job
+from app.models.scrape_job import JobStatus, ScrapeJob
+from app.models.user import User
+from app.services import scrape_service
+
+LEASE = 60
+
+
+class _RecordingRunner(JobRunner):
+    def __init__(self):
+        self.submitted: list[int] = []
+
+    def submit(self, func, *args, job_id: int, user_id: int | None = None, **kwargs) -> JobHandle:
+        self.submitted.append(job_id)
+        return JobHandle(job_id=job_id)
+
+    def cancel(self, handle: JobHandle) -> bool:
+        return False
+
+    def is_running(self, job_id: int) -> bool:
+        return job_id in self.submitted
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(scrape_service, "SessionLocal", factory)
+    monkeypatch.setattr(ownership, "SessionLocal", factory)
+    monkeypatch.setattr(scrape_service.settings, "job_queue", "memory")
+    monkeypatch.setattr(scrape_service.settings, "job_lease_seconds", LEASE)
+    db = factory()
+    db.add(User(id=1, email="owner@example.com", name="Owner", hashed_password="x"))
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+
+def _job(db, status=JobStatus.RUNNING, owner=None, heartbeat_age=None) -> int:
+    heartbeat = None
+    if heartbeat_age is not None:
+        heartbeat = datetime.now(timezone.utc) - timedelta(seconds=heartbeat_age)
+    job = ScrapeJob(
+        user_id=1, category="msp", location="Austin, TX", status=status,
+        owner=owner, owner_heartbeat_at=heartbeat,
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_claim_respects_a_live_owner(sessions):
+    db = sessions()
+    live = _job(db, owner="sibling", heartbeat_age=5)
+    dead = _job(db, owner="sibling", heartbeat_age=LEASE * 2)
+    unowned = _job(db, status=JobStatus.PENDING)
+    failed = _job(db, status=JobStatus.FAILED, owner="sibling", heartbeat_age=5)
+
+    assert not claim_job(db, live, LEASE)
+    assert claim_job(db, dead, LEASE)
+    assert claim_job(db, unowned, LEASE)
+    assert claim_job(db, failed, LEASE)
+    assert db.get(ScrapeJob, dead).owner == ownership.PROCESS_OWNER
+
+
+def test_only_one_of_two_processes_claims_a_job(sessions, monkeypatch):
+    db = sessions()
+    job_id = _job(db, owner="crashed", heartbeat_age=LEASE * 2)
+
+    assert claim_job(sessions(), job_id, LEASE)
+    # The second process sees the first one's fresh heartbeat
+    monkeypatch.setattr(ownership, "PROCESS_OWNER", "second-process")
+    assert not claim_job(sessions(), job_id, LEASE)
+
+
+def test_resume_skips_jobs_a_sibling_is_running(sessions):
+    db = sessions()
+    running = _job(db, owner="sibling", heartbeat_age=5)
+    queued = _job(db, status=JobStatus.PENDING, owner="sibling", heartbeat_age=5)
+    orphaned = _job(db, owner="crashed", heartbeat_age=LEASE * 2)
+
+    runner = _RecordingRunner()
+    assert scrape_service.resume_interrupted_jobs(runner) == [orphaned]
+    assert running not in runner.submitted and queued not in runner.submitted
+
+
+def test_heartbeat_renews_only_jobs_the_runner_holds(sessions, monkeypatch):
+    db = sessions()
+    held = _job(db)
+    dropped = _job(db)
+    runner = _RecordingRunner()
+    for job_id in (held, dropped):
+        assert claim_job(db, job_id, LEASE)
+    runner.submitted.append(held)
+    db.query(ScrapeJob).update({"owner_heartbeat_at": datetime.now(timezone.utc) - timedelta(seconds=LEASE * 2)})
+    db.commit()
+
+    OwnerHeartbeat(runner, LEASE).renew()
+
+    monkeypatch.setattr(ownership, "PROCESS_OWNER", "sibling")
+    assert not claim_job(sessions(), held, LEASE)
+    assert claim_job(sessions(), dropped, LEASE)
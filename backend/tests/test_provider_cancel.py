@@ -0,0 +1,67 @@
+"""A job cancelled while a provider call waits out a Retry-After stops the job,
+rather than being logged as a provider error."""
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.jobs.cancellation import CancellationToken, JobCancelled
+from app.scraper import enrichment, search
+from app.scraper.profiling import StageProfiler
+from app.scraper.providers import close_providers
+
+
+class _Throttled(BaseHTTPRequestHandler):
+    def _reply(self):
+        self.send_response(429)
+        self.send_header("Retry-After", "10")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def throttled_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Throttled)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    close_providers()
+
+
+def _cancel_soon(token: CancellationToken):
+    timer = threading.Timer(0.2, token.cancel)
+    timer.start()
+    return timer
+
+
+def test_search_cancel_during_retry_after(monkeypatch, throttled_url):
+    monkeypatch.setattr(search, "SERPER_MAPS_URL", throttled_url)
+    token, profiler = CancellationToken(), StageProfiler()
+    _cancel_soon(token)
+    started = time.monotonic()
+    with pytest.raises(JobCancelled):
+        search.search_google_places(
+            "msp", "Austin, TX", 20, serper_key="key", profiler=profiler,
+            geocoded={"Austin, TX": ""}, sleep=token.sleep,
+        )
+    assert time.monotonic() - started < 5
+    assert profiler.snapshot()["search"]["errors"] == 0
+
+
+def test_enrichment_cancel_during_retry_after(monkeypatch, throttled_url):
+    monkeypatch.setattr(enrichment, "HUNTER_DOMAIN_SEARCH_URL", throttled_url)
+    monkeypatch.setattr(enrichment, "APOLLO_ORG_ENRICH_URL", throttled_url)
+    for enrich, stage in ((enrichment.enrich_email_hunter, "hunter"), (enrichment.enrich_apollo, "apollo")):
+        token, profiler = CancellationToken(), StageProfiler()
+        _cancel_soon(token)
+        with pytest.raises(JobCancelled):
+            enrich("example.com", "key", profiler, token.sleep)
+        assert profiler.snapshot()[stage]["errors"] == 0
@@ -147,6 +147,10 @@ export default function LeadDetailPage() {
               <dt className="text-gray-500">Scrape Status</dt>
               <dd>{lead.scrape_status}</dd>
             </div>
+            <div className="flex justify-between">
+              <dt className="text-gray-500">Pages Crawled</dt>
+              <dd>{lead.pages_fetched}</dd>
+            </div>
             <div className="flex justify-between">
               <dt className="text-gray-500">Added</dt>
               <dd>{formatDate(lead.created_at)}</dd>
@@ -25,6 +25,7 @@ export interface Lead {
   ssl_valid: boolean
   score: number
   scrape_status: string
+  pages_fetched: number
   notes: string
   is_archived: boolean
   created_at: string